@@ -3,18 +3,32 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers import entity_registry as er
+from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.event import async_track_state_change_event
 from dataclasses import dataclass
+from simple_pid import PID
 from .coordinator import PIDDataCoordinator
+from .scheduler import PIDScheduler
+from .actuator import ActuatorProfile, OutputStage, profile_attributes
+from .filters import FilterChain
+from .parameters import PIDParameters
+from .persistence import PIDStateStore, async_remove_pid_state
+from .publish import PublishPolicy
+from .services import async_setup_services
+from .tick import PIDTick, TickHistory
 
 from .const import (
     DOMAIN,
     CONF_NAME,
     CONF_SENSOR_ENTITY_ID,
+    CONF_OUTPUT_ENTITY,
     CONF_INPUT_RANGE_MIN,
     CONF_INPUT_RANGE_MAX,
     CONF_OUTPUT_RANGE_MIN,
@@ -23,6 +37,47 @@ from .const import (
     DEFAULT_INPUT_RANGE_MAX,
     DEFAULT_OUTPUT_RANGE_MIN,
     DEFAULT_OUTPUT_RANGE_MAX,
+    CONF_EXECUTION_MODE,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_STALENESS,
+    DEFAULT_EXECUTION_MODE,
+    EXECUTION_MODE_INPUT_CHANGE,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_STALENESS,
+    CONF_OUTPUT_DEADBAND,
+    CONF_OUTPUT_DEADBAND_RELATIVE,
+    CONF_OUTPUT_REFRESH_INTERVAL,
+    DEFAULT_OUTPUT_DEADBAND,
+    DEFAULT_OUTPUT_DEADBAND_RELATIVE,
+    DEFAULT_OUTPUT_REFRESH_INTERVAL,
+    SIGNAL_OPTIONS_UPDATED,
+    SIGNAL_PARAMETERS_SET,
+    CONF_PUBLISH_EVERY_N_TICKS,
+    CONF_PUBLISH_MIN_CHANGE,
+    CONF_PUBLISH_MIN_CHANGE_RELATIVE,
+    CONF_PUBLISH_MIN_INTERVAL,
+    DEFAULT_PUBLISH_EVERY_N_TICKS,
+    DEFAULT_PUBLISH_MIN_CHANGE,
+    DEFAULT_PUBLISH_MIN_CHANGE_RELATIVE,
+    DEFAULT_PUBLISH_MIN_INTERVAL,
+    CONF_LATE_TICK_POLICY,
+    DEFAULT_LATE_TICK_POLICY,
+    CONF_INPUT_FILTERS,
+    CONF_FILTER_EMA_ALPHA,
+    CONF_FILTER_MEDIAN_WINDOW,
+    CONF_FILTER_LOWPASS_TAU,
+    CONF_FILTER_KALMAN_PROCESS_NOISE,
+    CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+    DEFAULT_INPUT_FILTERS,
+    DEFAULT_FILTER_EMA_ALPHA,
+    DEFAULT_FILTER_MEDIAN_WINDOW,
+    DEFAULT_FILTER_LOWPASS_TAU,
+    DEFAULT_FILTER_KALMAN_PROCESS_NOISE,
+    DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE,
+    CONF_HISTORY_SIZE,
+    DEFAULT_HISTORY_SIZE,
+    CONF_PARAMETER_COALESCE_WINDOW,
+    DEFAULT_PARAMETER_COALESCE_WINDOW,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,6 +89,11 @@ PLATFORMS: list[Platform] = [
     Platform.SELECT,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Platforms whose entities hold PID parameters
+PARAMETER_DOMAINS = (Platform.NUMBER, Platform.SWITCH, Platform.SELECT)
+
 
 @dataclass
 class MyData:
@@ -41,82 +101,387 @@ class MyData:
     coordinator: PIDDataCoordinator = None
 
 
+def resolve_config(entry: ConfigEntry) -> dict[str, Any]:
+    """Return the entry's configuration, options taking precedence over data."""
+    config = {**entry.data, **entry.options}
+    # An output entity cleared in the options falls back to the original one
+    config[CONF_OUTPUT_ENTITY] = entry.options.get(CONF_OUTPUT_ENTITY) or (
+        entry.data.get(CONF_OUTPUT_ENTITY)
+    )
+    return config
+
+
 class PIDDeviceHandle:
-    """Shared device handle for a PID controller config entry."""
+    """Shared device handle for a PID controller config entry.
+
+    There is exactly one handle per loaded entry, stored in
+    entry.runtime_data and used by all of its entities.
+    """
+
+    __slots__ = (
+        "hass",
+        "entry",
+        "name",
+        "pid",
+        "params",
+        "last_tick",
+        "last_known_output",
+        "history",
+        "state_store",
+        "actuator_profile",
+        "output_stage",
+        "publish_policy",
+        "input_filter",
+        "input_range_min",
+        "input_range_max",
+        "output_range_min",
+        "output_range_max",
+        "sensor_entity_id",
+        "output_entity_id",
+        "execution_mode",
+        "min_interval",
+        "max_staleness",
+        "late_tick_policy",
+        "parameter_coalesce_window",
+        "_input_filter_config",
+        "_entity_ids",
+        "_parameter_action",
+        "_parameter_batch",
+        "_parameter_entity_ids",
+        "_parameter_unsub",
+        "_output_unsub",
+        "_input_action",
+        "_input_wait_unsub",
+    )
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         self.hass = hass
         self.entry = entry
         self.name = entry.data.get(CONF_NAME)
-        self.input_range_min = entry.options.get(
-            CONF_INPUT_RANGE_MIN,
-            entry.data.get(CONF_INPUT_RANGE_MIN, DEFAULT_INPUT_RANGE_MIN),
+        # Created by the sensor platform
+        self.pid: PID | None = None
+        self.actuator_profile: ActuatorProfile | None = None
+        self.output_stage = OutputStage()
+        self.publish_policy = PublishPolicy()
+        self.input_filter: FilterChain | None = None
+        self.history = TickHistory(0)
+        self._input_filter_config: tuple | None = None
+        self._load_options()
+        self.last_tick: PIDTick | None = None
+        self.last_known_output: float | None = None
+        self.params = PIDParameters()
+        # (platform, key) -> entity_id, filled lazily from the entity registry
+        self._entity_ids: dict[tuple[str, str], str | None] = {}
+        # Parameter entities currently tracked for state changes
+        self._parameter_action = None
+        # set_parameters batches whose state changes are still to come
+        self._parameter_batch = 0
+        self._parameter_entity_ids: list[str] = []
+        self._parameter_unsub: CALLBACK_TYPE | None = None
+        self._output_unsub: CALLBACK_TYPE | None = None
+        # Subscription on the input sensor until it has a valid value
+        self._input_action = None
+        self._input_wait_unsub: CALLBACK_TYPE | None = None
+        self.state_store = PIDStateStore(hass, self)
+
+    def _load_options(self) -> None:
+        """Read the configuration from one snapshot of the entry."""
+        config = resolve_config(self.entry)
+        self.input_range_min = config.get(CONF_INPUT_RANGE_MIN, DEFAULT_INPUT_RANGE_MIN)
+        self.input_range_max = config.get(CONF_INPUT_RANGE_MAX, DEFAULT_INPUT_RANGE_MAX)
+        self.output_range_min = config.get(
+            CONF_OUTPUT_RANGE_MIN, DEFAULT_OUTPUT_RANGE_MIN
         )
-        self.input_range_max = entry.options.get(
-            CONF_INPUT_RANGE_MAX,
-            entry.data.get(CONF_INPUT_RANGE_MAX, DEFAULT_INPUT_RANGE_MAX),
+        self.output_range_max = config.get(
+            CONF_OUTPUT_RANGE_MAX, DEFAULT_OUTPUT_RANGE_MAX
         )
-        self.output_range_min = entry.options.get(
-            CONF_OUTPUT_RANGE_MIN,
-            entry.data.get(CONF_OUTPUT_RANGE_MIN, DEFAULT_OUTPUT_RANGE_MIN),
+        self.sensor_entity_id = config.get(CONF_SENSOR_ENTITY_ID)
+        self.output_entity_id = config[CONF_OUTPUT_ENTITY]
+        self.execution_mode = config.get(CONF_EXECUTION_MODE, DEFAULT_EXECUTION_MODE)
+        self.min_interval = config.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)
+        self.max_staleness = config.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+        self._load_input_filter(config)
+        history_size = int(config.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE))
+        if history_size != self.history.capacity:
+            self.history = TickHistory(history_size)
+        self.late_tick_policy = config.get(
+            CONF_LATE_TICK_POLICY, DEFAULT_LATE_TICK_POLICY
         )
-        self.output_range_max = entry.options.get(
-            CONF_OUTPUT_RANGE_MAX,
-            entry.data.get(CONF_OUTPUT_RANGE_MAX, DEFAULT_OUTPUT_RANGE_MAX),
+        self.parameter_coalesce_window = config.get(
+            CONF_PARAMETER_COALESCE_WINDOW, DEFAULT_PARAMETER_COALESCE_WINDOW
         )
-        self.sensor_entity_id = entry.options.get(
-            CONF_SENSOR_ENTITY_ID, entry.data.get(CONF_SENSOR_ENTITY_ID)
+        self.output_stage.deadband = config.get(
+            CONF_OUTPUT_DEADBAND, DEFAULT_OUTPUT_DEADBAND
         )
-        self.last_contributions = (None, None, None)  # (P, I, D)
+        self.output_stage.deadband_relative = config.get(
+            CONF_OUTPUT_DEADBAND_RELATIVE, DEFAULT_OUTPUT_DEADBAND_RELATIVE
+        )
+        self.output_stage.refresh_interval = config.get(
+            CONF_OUTPUT_REFRESH_INTERVAL, DEFAULT_OUTPUT_REFRESH_INTERVAL
+        )
+        self.publish_policy.every_n_ticks = int(
+            config.get(CONF_PUBLISH_EVERY_N_TICKS, DEFAULT_PUBLISH_EVERY_N_TICKS)
+        )
+        self.publish_policy.min_change = config.get(
+            CONF_PUBLISH_MIN_CHANGE, DEFAULT_PUBLISH_MIN_CHANGE
+        )
+        self.publish_policy.min_change_relative = config.get(
+            CONF_PUBLISH_MIN_CHANGE_RELATIVE, DEFAULT_PUBLISH_MIN_CHANGE_RELATIVE
+        )
+        self.publish_policy.min_interval = config.get(
+            CONF_PUBLISH_MIN_INTERVAL, DEFAULT_PUBLISH_MIN_INTERVAL
+        )
+
+    def _load_input_filter(self, config: dict[str, Any]) -> None:
+        """Build the input filter chain, keeping its state if unchanged."""
+        filter_config = (
+            tuple(config.get(CONF_INPUT_FILTERS, DEFAULT_INPUT_FILTERS)),
+            config.get(CONF_FILTER_EMA_ALPHA, DEFAULT_FILTER_EMA_ALPHA),
+            config.get(CONF_FILTER_MEDIAN_WINDOW, DEFAULT_FILTER_MEDIAN_WINDOW),
+            config.get(CONF_FILTER_LOWPASS_TAU, DEFAULT_FILTER_LOWPASS_TAU),
+            config.get(
+                CONF_FILTER_KALMAN_PROCESS_NOISE, DEFAULT_FILTER_KALMAN_PROCESS_NOISE
+            ),
+            config.get(
+                CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+                DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE,
+            ),
+        )
+        if filter_config == self._input_filter_config:
+            return
+        self._input_filter_config = filter_config
+        self.input_filter = FilterChain(*filter_config)
+        _LOGGER.debug("Input filters of %s: %s", self.name, self.input_filter.names)
+
+    @callback
+    def async_update_options(self) -> None:
+        """Apply changed options to the running controller.
+
+        The PID instance and its integrator are kept; only routing, ranges
+        and output settings change.
+        """
+        old_output_entity_id = self.output_entity_id
+        old_sensor_entity_id = self.sensor_entity_id
+        self._load_options()
+        if self.sensor_entity_id != old_sensor_entity_id and self.input_pending:
+            action = self._input_action
+            if self.async_wait_for_input(action) is None:
+                # The new sensor has a value already
+                self.hass.async_create_task(action())
+        if self.output_entity_id != old_output_entity_id:
+            _LOGGER.debug(
+                "Output entity changed from %s to %s",
+                old_output_entity_id,
+                self.output_entity_id,
+            )
+            self.actuator_profile = None
+            self.async_follow_output_entity()
 
     def _get_entity_id(self, platform: str, key: str) -> str | None:
         """Lookup the real entity_id in the registry by unique_id == '<entry_id>_<key>'."""
+        try:
+            return self._entity_ids[(platform, key)]
+        except KeyError:
+            pass
         registry = er.async_get(self.hass)
         unique = f"{self.entry.entry_id}_{key}"
         entity_id = registry.async_get_entity_id(platform, DOMAIN, unique)
         if not entity_id:
             _LOGGER.debug("No %s entity found for unique_id '%s'", platform, unique)
+        self._entity_ids[(platform, key)] = entity_id
         return entity_id
 
-    def get_number(self, key: str) -> float | None:
-        """Return the current value of the number entity, or None."""
-        entity_id = self._get_entity_id("number", key)
-        if not entity_id:
+    def get_entity_id(self, platform: str, key: str) -> str | None:
+        """Return the entity_id of this entry's entity for key, or None."""
+        return self._get_entity_id(platform, key)
+
+    @callback
+    def async_listen_registry_updates(self):
+        """Invalidate the entity_id cache on registry changes for this entry."""
+        return self.hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED,
+            self._async_registry_updated,
+            event_filter=self._async_registry_filter,
+        )
+
+    @callback
+    def _async_registry_filter(self, event_data) -> bool:
+        """Return True if a registry change touches one of our entities."""
+        for known in (self._entity_ids.values(), self._parameter_entity_ids):
+            if (
+                event_data["entity_id"] in known
+                or event_data.get("old_entity_id") in known
+            ):
+                return True
+        if event_data["action"] != "create":
+            return False
+        entity = er.async_get(self.hass).async_get(event_data["entity_id"])
+        return entity is not None and entity.config_entry_id == self.entry.entry_id
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        """Drop cached entity_ids so they are resolved again on next read."""
+        _LOGGER.debug("Entity registry changed (%s), clearing cache", event.data)
+        self._entity_ids.clear()
+        if self._parameter_action is not None:
+            self._async_track_parameter_entities()
+
+    @callback
+    def async_track_parameter_changes(self, action) -> CALLBACK_TYPE:
+        """Call action when one of this entry's parameter entities changes."""
+        self._parameter_action = action
+        self._async_track_parameter_entities()
+
+        @callback
+        def _async_unsub() -> None:
+            self._parameter_action = None
+            if self._parameter_unsub is not None:
+                self._parameter_unsub()
+                self._parameter_unsub = None
+
+        return _async_unsub
+
+    @callback
+    def _async_track_parameter_entities(self) -> None:
+        """(Re)subscribe to the current entity_ids of the parameter entities."""
+        if self._parameter_unsub is not None:
+            self._parameter_unsub()
+        registry = er.async_get(self.hass)
+        self._parameter_entity_ids = [
+            entity.entity_id
+            for entity in er.async_entries_for_config_entry(
+                registry, self.entry.entry_id
+            )
+            if entity.domain in PARAMETER_DOMAINS
+        ]
+        _LOGGER.debug("Tracking parameter entities %s", self._parameter_entity_ids)
+        self._parameter_unsub = async_track_state_change_event(
+            self.hass, self._parameter_entity_ids, self._async_parameter_changed
+        )
+
+    @callback
+    def _async_parameter_changed(self, event: Event) -> None:
+        """Pass a parameter change on, unless it is part of a batch."""
+        if self._parameter_batch:
+            return
+        self.hass.async_run_hass_job(HassJob(self._parameter_action), event)
+
+    @callback
+    def async_set_parameters(self, values: dict[str, Any]) -> None:
+        """Apply several parameters at once.
+
+        The parameters and the entity states change together, and the
+        state changes do not request a refresh each; the caller refreshes
+        the coordinator once afterwards.
+        """
+        for key, value in values.items():
+            self.params.update(key, value)
+        self._parameter_batch += 1
+        try:
+            async_dispatcher_send(
+                self.hass, SIGNAL_PARAMETERS_SET.format(self.entry.entry_id), values
+            )
+        finally:
+            # State change listeners are called soon, not right away; end the
+            # batch after them, call_soon callbacks run in order
+            self.hass.loop.call_soon(self._async_end_parameter_batch)
+
+    @callback
+    def _async_end_parameter_batch(self) -> None:
+        self._parameter_batch -= 1
+
+    def get_actuator_profile(self) -> ActuatorProfile | None:
+        """Return the cached profile of the output entity, building it if needed."""
+        if not self.output_entity_id:
             return None
-        state = self.hass.states.get(entity_id)
-        _LOGGER.debug("get_number(%s) → %s = %s", key, entity_id, state and state.state)
-        if state and state.state not in ("unknown", "unavailable"):
-            try:
-                return float(state.state)
-            except ValueError:
-                _LOGGER.error(
-                    "Could not parse state '%s' of %s as float", state.state, entity_id
-                )
-        return None
+        if self.actuator_profile is None:
+            self.actuator_profile = ActuatorProfile(
+                self.output_entity_id, self.hass.states.get(self.output_entity_id)
+            )
+        return self.actuator_profile
 
-    def get_select(self, key: str) -> str | None:
-        """Return the current value of the select entity, or None."""
-        entity_id = self._get_entity_id("select", key)
-        if not entity_id:
+    @callback
+    def async_track_output_entity(self) -> CALLBACK_TYPE | None:
+        """Rebuild the actuator profile when the output entity's attributes change."""
+        if not self.output_entity_id:
             return None
-        state = self.hass.states.get(entity_id)
-        _LOGGER.debug("get_select(%s) → %s = %s", key, entity_id, state and state.state)
 
-        if state and state.state not in ("unknown", "unavailable"):
-            return state.state  # Selects geven strings terug, geen conversie nodig
+        @callback
+        def _async_output_changed(event: Event) -> None:
+            old_state = event.data["old_state"]
+            new_state = event.data["new_state"]
+            if (
+                old_state is not None
+                and new_state is not None
+                and profile_attributes(event.data["entity_id"], old_state)
+                == profile_attributes(event.data["entity_id"], new_state)
+            ):
+                return
+            _LOGGER.debug("Attributes of %s changed", self.output_entity_id)
+            self.actuator_profile = None
 
-        return None
+        return async_track_state_change_event(
+            self.hass, self.output_entity_id, _async_output_changed
+        )
 
-    def get_switch(self, key: str) -> bool:
-        """Return True/False of switch entity, default True if missing."""
-        entity_id = self._get_entity_id("switch", key)
-        if not entity_id:
-            return True
-        state = self.hass.states.get(entity_id)
-        _LOGGER.debug("get_switch(%s) → %s = %s", key, entity_id, state and state.state)
-        if state and state.state not in ("unknown", "unavailable"):
-            return state.state == "on"
-        return True
+    @callback
+    def async_follow_output_entity(self) -> None:
+        """Track the currently configured output entity, replacing the old one."""
+        self.async_unfollow_output_entity()
+        self._output_unsub = self.async_track_output_entity()
+
+    @callback
+    def async_unfollow_output_entity(self) -> None:
+        """Stop tracking the output entity."""
+        if self._output_unsub is not None:
+            self._output_unsub()
+            self._output_unsub = None
+
+    @property
+    def input_pending(self) -> bool:
+        """Return True while waiting for the first valid input reading."""
+        return self._input_wait_unsub is not None
+
+    @callback
+    def async_wait_for_input(self, action) -> CALLBACK_TYPE | None:
+        """Call action once the input sensor reports a valid value.
+
+        Returns None if the sensor has a valid value already, otherwise a
+        callback to stop waiting. Calling it again replaces the previous wait.
+        """
+        self.async_stop_waiting_for_input()
+        if self.get_input_sensor_value() is not None:
+            return None
+        _LOGGER.warning(
+            "Input sensor %s of %s is not available yet, waiting for it",
+            self.sensor_entity_id,
+            self.name,
+        )
+
+        @callback
+        def _async_input_changed(event: Event) -> None:
+            if self.get_input_sensor_value() is None:
+                return
+            _LOGGER.info(
+                "Input sensor %s of %s is available, starting control",
+                self.sensor_entity_id,
+                self.name,
+            )
+            self.async_stop_waiting_for_input()
+            self.hass.async_create_task(action())
+
+        self._input_action = action
+        self._input_wait_unsub = async_track_state_change_event(
+            self.hass, self.sensor_entity_id, _async_input_changed
+        )
+        return self.async_stop_waiting_for_input
+
+    @callback
+    def async_stop_waiting_for_input(self) -> None:
+        """Stop waiting for the input sensor."""
+        if self._input_wait_unsub is not None:
+            self._input_wait_unsub()
+            self._input_wait_unsub = None
 
     def get_input_sensor_value(self) -> float | None:
         """Return the input value from configured sensor."""
@@ -131,37 +496,90 @@ class PIDDeviceHandle:
         return None
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Simple PID Controller from a config entry."""
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the actions of the Simple PID Controller integration."""
+    async_setup_services(hass)
+    return True
 
-    sensor_entity_id = entry.options.get(
-        CONF_SENSOR_ENTITY_ID, entry.data.get(CONF_SENSOR_ENTITY_ID)
-    )
-    state = hass.states.get(sensor_entity_id)
-    if state is None or state.state in ("unknown", "unavailable"):
-        _LOGGER.warning("Sensor %s not ready; delaying setup", sensor_entity_id)
-        raise ConfigEntryNotReady(f"Sensor {sensor_entity_id} not ready")
 
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Simple PID Controller from a config entry."""
     handle = PIDDeviceHandle(hass, entry)
     entry.runtime_data = MyData(handle=handle)
+    entry.async_on_unload(handle.async_listen_registry_updates())
+    handle.async_follow_output_entity()
+    entry.async_on_unload(handle.async_unfollow_output_entity)
 
     # register updatelistener for optionsflow
     entry.async_on_unload(entry.add_update_listener(_async_update_options_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Refresh the PID whenever one of its parameters changes
+    async def _async_parameter_changed(event: Event) -> None:
+        _LOGGER.debug("Update detected on %s", event.data["entity_id"])
+        if (coordinator := entry.runtime_data.coordinator) is not None:
+            await coordinator.async_request_refresh()
+
+    entry.async_on_unload(
+        handle.async_track_parameter_changes(_async_parameter_changed)
+    )
+
+    # Without a valid input the controller cannot run yet. Rather than
+    # retrying the whole setup, run the first tick as soon as a value arrives.
+    coordinator = entry.runtime_data.coordinator
+
+    async def _async_input_available() -> None:
+        await coordinator.async_refresh()
+
+    if (unsub := handle.async_wait_for_input(_async_input_available)) is not None:
+        entry.async_on_unload(unsub)
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        # Writes still running must not outlive the entry
+        entry.runtime_data.handle.output_stage.async_shutdown()
+        # Keep the controller state for the next setup, e.g. after a reload
+        await entry.runtime_data.handle.state_store.async_save()
+        scheduler: PIDScheduler | None = hass.data.get(DOMAIN)
+        if scheduler is not None and entry.runtime_data.coordinator is not None:
+            scheduler.async_remove(entry.runtime_data.coordinator)
         # reset runtime_data zodat tests slagen
         entry.runtime_data = None
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved controller state of a deleted config entry."""
+    await async_remove_pid_state(hass, entry.entry_id)
+
+
 async def _async_update_options_listener(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> None:
     """Update after options are changed in optionsflow"""
-    await hass.config_entries.async_reload(entry.entry_id)
+    handle: PIDDeviceHandle = entry.runtime_data.handle
+    execution_mode = resolve_config(entry).get(
+        CONF_EXECUTION_MODE, DEFAULT_EXECUTION_MODE
+    )
+    if execution_mode != handle.execution_mode:
+        # The coordinator is driven differently, set it up again
+        _LOGGER.debug("Execution mode of %s changed, reloading", handle.name)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    handle.async_update_options()
+    coordinator = entry.runtime_data.coordinator
+    if coordinator is not None:
+        coordinator.late_tick_policy = handle.late_tick_policy
+        coordinator.coalesce_window = handle.parameter_coalesce_window
+    if coordinator is not None and execution_mode == EXECUTION_MODE_INPUT_CHANGE:
+        # Replaces the subscription on the previous input sensor
+        coordinator.async_track_input(
+            handle.sensor_entity_id, handle.min_interval, handle.max_staleness
+        )
+    async_dispatcher_send(hass, SIGNAL_OPTIONS_UPDATED.format(entry.entry_id))
+    _LOGGER.debug("Options of %s applied without reload", handle.name)
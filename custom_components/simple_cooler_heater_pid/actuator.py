@@ -0,0 +1,381 @@
+"""Output stage for Simple PID Controller."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from time import perf_counter
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+from homeassistant.const import ATTR_SUPPORTED_FEATURES
+from homeassistant.core import HomeAssistant, State, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# A write taking longer than this is given up, so one hanging call cannot
+# block the actuator for good
+WRITE_TIMEOUT = 30
+
+
+class ActuatorDriver(NamedTuple):
+    """How PID outputs are written to the entities of one domain.
+
+    min_value/max_value is a fixed clamp range, min_attr/max_attr name the
+    state attributes holding the entity's own range and step_attr the one
+    holding its step (if None, the first attribute containing "step").
+    scale multiplies the output before it is quantized and clamped.
+    """
+
+    service: str
+    value_field: str
+    min_value: float | None = None
+    max_value: float | None = None
+    min_attr: str | None = None
+    max_attr: str | None = None
+    step_attr: str | None = None
+    scale: float = 1.0
+
+
+# domain -> driver, extended with register_actuator_driver
+ACTUATOR_DRIVERS: dict[str, ActuatorDriver] = {
+    "number": ActuatorDriver(
+        "set_value", "value", min_attr="min", max_attr="max", step_attr="step"
+    ),
+    "input_number": ActuatorDriver(
+        "set_value", "value", min_attr="min", max_attr="max", step_attr="step"
+    ),
+    "fan": ActuatorDriver(
+        "set_percentage", "percentage", 0, 100, step_attr="percentage_step"
+    ),
+    "light": ActuatorDriver("turn_on", "brightness_pct", 0, 100),
+    "climate": ActuatorDriver(
+        "set_temperature",
+        "temperature",
+        min_attr="min_temp",
+        max_attr="max_temp",
+        step_attr="target_temp_step",
+    ),
+    "water_heater": ActuatorDriver(
+        "set_temperature",
+        "temperature",
+        min_attr="min_temp",
+        max_attr="max_temp",
+        step_attr="target_temp_step",
+    ),
+    "valve": ActuatorDriver("set_valve_position", "position", 0, 100),
+    "cover": ActuatorDriver("set_cover_position", "position", 0, 100),
+}
+
+
+def register_actuator_driver(domain: str, driver: ActuatorDriver) -> None:
+    """Make entities of domain usable as output entity."""
+    ACTUATOR_DRIVERS[domain] = driver
+
+
+def _step_attribute(driver: ActuatorDriver | None, attrs: Mapping[str, Any]) -> Any:
+    """Return the step the driver reads from attrs, if any."""
+    if driver is not None and driver.step_attr is not None:
+        return attrs.get(driver.step_attr)
+    for key, value in attrs.items():
+        if "step" in key.lower():
+            return value  # first attribute containing 'step'
+    return None
+
+
+def profile_attributes(entity_id: str, state: State) -> tuple[Any, ...]:
+    """Return the attributes of state that an ActuatorProfile is built from.
+
+    Values such as a fan's percentage or a climate's current temperature
+    change all the time; the profile only has to be rebuilt when these do.
+    """
+    attrs = state.attributes
+    driver = ACTUATOR_DRIVERS.get(entity_id.split(".")[0])
+    if driver is None:
+        return (_step_attribute(None, attrs), attrs.get(ATTR_SUPPORTED_FEATURES))
+    return (
+        _step_attribute(driver, attrs),
+        attrs.get(driver.min_attr),
+        attrs.get(driver.max_attr),
+        attrs.get(ATTR_SUPPORTED_FEATURES),
+    )
+
+
+class ActuatorProfile:
+    """A driver bound to one output entity.
+
+    Built once from the entity state and only rebuilt when the attributes
+    it is built from (see profile_attributes) or the configured output
+    entity change, so the control loop does not scan attributes every tick.
+    """
+
+    __slots__ = (
+        "entity_id",
+        "domain",
+        "service",
+        "value_field",
+        "scale",
+        "min_value",
+        "max_value",
+        "step",
+        "integer",
+    )
+
+    def __init__(self, entity_id: str, state: State | None) -> None:
+        """Resolve the profile of entity_id from its current state."""
+        self.entity_id = entity_id
+        self.domain = entity_id.split(".")[0]
+        self.service: str | None = None
+        self.value_field: str | None = None
+        self.scale = 1.0
+        self.min_value: float | None = None
+        self.max_value: float | None = None
+        self.step: float | None = None
+        self.integer = False
+
+        driver = ACTUATOR_DRIVERS.get(self.domain)
+        if driver is not None:
+            self.service = driver.service
+            self.value_field = driver.value_field
+            self.scale = driver.scale
+            self.min_value = driver.min_value
+            self.max_value = driver.max_value
+        else:
+            _LOGGER.warning("Output entity domain %s not supported", self.domain)
+
+        if state is None:
+            _LOGGER.warning("State for entity %s not found", entity_id)
+            return
+
+        attrs = state.attributes
+        self._set_step(_step_attribute(driver, attrs))
+
+        if driver is not None:
+            if isinstance(attrs.get(driver.min_attr), (int, float)):
+                self.min_value = attrs[driver.min_attr]
+            if isinstance(attrs.get(driver.max_attr), (int, float)):
+                self.max_value = attrs[driver.max_attr]
+
+        _LOGGER.debug(
+            "Output entity %s: service=%s.%s step=%s integer=%s range=%s..%s",
+            entity_id,
+            self.domain,
+            self.service,
+            self.step,
+            self.integer,
+            self.min_value,
+            self.max_value,
+        )
+
+    def _set_step(self, step: Any) -> None:
+        if isinstance(step, (int, float)) and step > 0:
+            self.step = step
+            self.integer = step >= 1
+
+    def convert(self, output: float) -> float:
+        """Scale, quantize and clamp a PID output to what the actuator accepts."""
+        if self.scale != 1.0:
+            output *= self.scale
+        if self.step is not None:
+            output = round(output / self.step) * self.step
+            # Drop float noise, e.g. 0.30000000000000004 for step 0.1
+            output = round(output) if self.integer else round(output, 10)
+        if self.min_value is not None and output < self.min_value:
+            output = self.min_value
+        if self.max_value is not None and output > self.max_value:
+            output = self.max_value
+        return output
+
+    def service_data(self, value: float) -> dict[str, Any]:
+        """Return the service data writing a converted value."""
+        return {"entity_id": self.entity_id, self.value_field: value}
+
+
+class ActuatorWriteQueue:
+    """Service calls to one output entity, at most one of them in flight.
+
+    While a write runs, a new value is kept as the single pending write and
+    replaces any value pending before it. So at most two writes exist per
+    entity, they land in order and the latest output always wins.
+    """
+
+    __slots__ = (
+        "hass",
+        "entity_id",
+        "writes_completed",
+        "writes_failed",
+        "writes_replaced",
+        "max_depth",
+        "last_latency",
+        "max_latency",
+        "_latency_sum",
+        "_pending",
+        "_task",
+    )
+
+    def __init__(self, hass: HomeAssistant, entity_id: str) -> None:
+        """Initialize an empty queue for entity_id."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self.writes_completed = 0
+        self.writes_failed = 0
+        # Pending writes dropped because a newer value came in
+        self.writes_replaced = 0
+        self.max_depth = 0
+        self.last_latency: float | None = None
+        self.max_latency = 0.0
+        self._latency_sum = 0.0
+        # (domain, service, service_data) waiting for the running write
+        self._pending: tuple[str, str, dict[str, Any]] | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def depth(self) -> int:
+        """Return the number of writes running or waiting."""
+        return (self._task is not None) + (self._pending is not None)
+
+    @callback
+    def async_write(self, domain: str, service: str, data: dict[str, Any]) -> None:
+        """Write data with domain.service, after the running write if any."""
+        if self._task is not None:
+            if self._pending is not None:
+                self.writes_replaced += 1
+            self._pending = (domain, service, data)
+        else:
+            # Not started eagerly, so the task is stored before it can finish
+            self._task = self.hass.async_create_task(
+                self._async_run((domain, service, data)),
+                f"{self.entity_id} actuator write",
+                eager_start=False,
+            )
+        self.max_depth = max(self.max_depth, self.depth)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the pending write and cancel the running one."""
+        self._pending = None
+        if self._task is not None:
+            self._task.cancel()
+            # A task cancelled before it started does not reach its finally
+            self._task = None
+
+    async def _async_run(self, call: tuple[str, str, dict[str, Any]] | None) -> None:
+        """Perform writes until nothing is pending."""
+        try:
+            while call is not None:
+                domain, service, data = call
+                started = perf_counter()
+                try:
+                    async with asyncio.timeout(WRITE_TIMEOUT):
+                        await self.hass.services.async_call(
+                            domain, service, data, blocking=True
+                        )
+                except Exception as err:
+                    self.writes_failed += 1
+                    _LOGGER.warning(
+                        "Writing %s to %s failed: %r", data, self.entity_id, err
+                    )
+                else:
+                    self.writes_completed += 1
+                latency = perf_counter() - started
+                self.last_latency = latency
+                self._latency_sum += latency
+                if latency > self.max_latency:
+                    self.max_latency = latency
+                call, self._pending = self._pending, None
+        finally:
+            self._task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        done = self.writes_completed + self.writes_failed
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "writes_completed": self.writes_completed,
+            "writes_failed": self.writes_failed,
+            "writes_replaced": self.writes_replaced,
+            "last_latency": self.last_latency,
+            "mean_latency": self._latency_sum / done if done else None,
+            "max_latency": self.max_latency,
+        }
+
+
+class OutputStage:
+    """Decide which PID outputs are actually written to the actuator.
+
+    The last written value is remembered per output entity. A new value is
+    only written when it leaves the deadband around that value, or when the
+    refresh interval has passed so the actuator stays in sync.
+    """
+
+    __slots__ = (
+        "deadband",
+        "deadband_relative",
+        "refresh_interval",
+        "writes_issued",
+        "writes_suppressed",
+        "_last",
+        "_queues",
+    )
+
+    def __init__(
+        self,
+        deadband: float = 0.0,
+        deadband_relative: float = 0.0,
+        refresh_interval: float = 0.0,
+    ) -> None:
+        """Initialize the output stage.
+
+        deadband is absolute, deadband_relative a percentage of the last
+        written value and refresh_interval is in seconds (0 disables it).
+        """
+        self.deadband = deadband
+        self.deadband_relative = deadband_relative
+        self.refresh_interval = refresh_interval
+        self.writes_issued = 0
+        self.writes_suppressed = 0
+        # entity_id -> (last written value, time of that write)
+        self._last: dict[str, tuple[float, float]] = {}
+        self._queues: dict[str, ActuatorWriteQueue] = {}
+
+    def should_write(self, entity_id: str, value: float, now: float) -> bool:
+        """Return True if value must be written, and record it as written."""
+        last = self._last.get(entity_id)
+        if last is not None:
+            last_value, last_time = last
+            band = max(self.deadband, abs(last_value) * self.deadband_relative / 100)
+            stale = (
+                self.refresh_interval > 0 and now - last_time >= self.refresh_interval
+            )
+            if abs(value - last_value) <= band and not stale:
+                self.writes_suppressed += 1
+                return False
+        self._last[entity_id] = (value, now)
+        self.writes_issued += 1
+        return True
+
+    def queue(self, hass: HomeAssistant, entity_id: str) -> ActuatorWriteQueue:
+        """Return the write queue of entity_id, creating it on first use."""
+        if (queue := self._queues.get(entity_id)) is None:
+            queue = self._queues[entity_id] = ActuatorWriteQueue(hass, entity_id)
+        return queue
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel all writes, e.g. when the config entry is unloaded."""
+        for queue in self._queues.values():
+            queue.async_cancel()
+
+    def as_dict(self) -> dict:
+        """Return the counters for diagnostics."""
+        return {
+            "writes_issued": self.writes_issued,
+            "writes_suppressed": self.writes_suppressed,
+            "last_written": {
+                entity_id: value for entity_id, (value, _) in self._last.items()
+            },
+            "queues": {
+                entity_id: queue.as_dict() for entity_id, queue in self._queues.items()
+            },
+        }
@@ -30,7 +30,52 @@ from .const import (
     DEFAULT_OUTPUT_RANGE_MIN,
     DEFAULT_OUTPUT_RANGE_MAX,
     CONF_OUTPUT_ENTITY,
+    CONF_EXECUTION_MODE,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_STALENESS,
+    EXECUTION_MODE_INTERVAL,
+    EXECUTION_MODE_INPUT_CHANGE,
+    EXECUTION_MODE_HIGH_RATE,
+    DEFAULT_EXECUTION_MODE,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_STALENESS,
+    CONF_OUTPUT_DEADBAND,
+    CONF_OUTPUT_DEADBAND_RELATIVE,
+    CONF_OUTPUT_REFRESH_INTERVAL,
+    DEFAULT_OUTPUT_DEADBAND,
+    DEFAULT_OUTPUT_DEADBAND_RELATIVE,
+    DEFAULT_OUTPUT_REFRESH_INTERVAL,
+    CONF_PUBLISH_EVERY_N_TICKS,
+    CONF_PUBLISH_MIN_CHANGE,
+    CONF_PUBLISH_MIN_CHANGE_RELATIVE,
+    CONF_PUBLISH_MIN_INTERVAL,
+    DEFAULT_PUBLISH_EVERY_N_TICKS,
+    DEFAULT_PUBLISH_MIN_CHANGE,
+    DEFAULT_PUBLISH_MIN_CHANGE_RELATIVE,
+    DEFAULT_PUBLISH_MIN_INTERVAL,
+    CONF_LATE_TICK_POLICY,
+    LATE_TICK_SKIP,
+    LATE_TICK_REAL_DT,
+    LATE_TICK_CLAMP_DT,
+    DEFAULT_LATE_TICK_POLICY,
+    CONF_INPUT_FILTERS,
+    CONF_FILTER_EMA_ALPHA,
+    CONF_FILTER_MEDIAN_WINDOW,
+    CONF_FILTER_LOWPASS_TAU,
+    CONF_FILTER_KALMAN_PROCESS_NOISE,
+    CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+    DEFAULT_INPUT_FILTERS,
+    DEFAULT_FILTER_EMA_ALPHA,
+    DEFAULT_FILTER_MEDIAN_WINDOW,
+    DEFAULT_FILTER_LOWPASS_TAU,
+    DEFAULT_FILTER_KALMAN_PROCESS_NOISE,
+    DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE,
+    CONF_HISTORY_SIZE,
+    DEFAULT_HISTORY_SIZE,
+    CONF_PARAMETER_COALESCE_WINDOW,
+    DEFAULT_PARAMETER_COALESCE_WINDOW,
 )
+from .filters import FILTER_EMA, FILTER_KALMAN, FILTER_LOWPASS, FILTER_MEDIAN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -155,6 +200,64 @@ class PIDControllerOptionsFlowHandler(OptionsFlow):
         current_output_entity = self.config_entry.options.get(
             CONF_OUTPUT_ENTITY
         ) or self.config_entry.data.get(CONF_OUTPUT_ENTITY)
+        current_execution_mode = self.config_entry.options.get(
+            CONF_EXECUTION_MODE, DEFAULT_EXECUTION_MODE
+        )
+        current_late_tick_policy = self.config_entry.options.get(
+            CONF_LATE_TICK_POLICY, DEFAULT_LATE_TICK_POLICY
+        )
+        current_min_interval = self.config_entry.options.get(
+            CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL
+        )
+        current_max_staleness = self.config_entry.options.get(
+            CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS
+        )
+        current_output_deadband = self.config_entry.options.get(
+            CONF_OUTPUT_DEADBAND, DEFAULT_OUTPUT_DEADBAND
+        )
+        current_output_deadband_relative = self.config_entry.options.get(
+            CONF_OUTPUT_DEADBAND_RELATIVE, DEFAULT_OUTPUT_DEADBAND_RELATIVE
+        )
+        current_output_refresh_interval = self.config_entry.options.get(
+            CONF_OUTPUT_REFRESH_INTERVAL, DEFAULT_OUTPUT_REFRESH_INTERVAL
+        )
+        current_publish_every_n_ticks = self.config_entry.options.get(
+            CONF_PUBLISH_EVERY_N_TICKS, DEFAULT_PUBLISH_EVERY_N_TICKS
+        )
+        current_publish_min_change = self.config_entry.options.get(
+            CONF_PUBLISH_MIN_CHANGE, DEFAULT_PUBLISH_MIN_CHANGE
+        )
+        current_publish_min_change_relative = self.config_entry.options.get(
+            CONF_PUBLISH_MIN_CHANGE_RELATIVE, DEFAULT_PUBLISH_MIN_CHANGE_RELATIVE
+        )
+        current_publish_min_interval = self.config_entry.options.get(
+            CONF_PUBLISH_MIN_INTERVAL, DEFAULT_PUBLISH_MIN_INTERVAL
+        )
+        current_input_filters = self.config_entry.options.get(
+            CONF_INPUT_FILTERS, DEFAULT_INPUT_FILTERS
+        )
+        current_filter_ema_alpha = self.config_entry.options.get(
+            CONF_FILTER_EMA_ALPHA, DEFAULT_FILTER_EMA_ALPHA
+        )
+        current_filter_median_window = self.config_entry.options.get(
+            CONF_FILTER_MEDIAN_WINDOW, DEFAULT_FILTER_MEDIAN_WINDOW
+        )
+        current_filter_lowpass_tau = self.config_entry.options.get(
+            CONF_FILTER_LOWPASS_TAU, DEFAULT_FILTER_LOWPASS_TAU
+        )
+        current_filter_kalman_process_noise = self.config_entry.options.get(
+            CONF_FILTER_KALMAN_PROCESS_NOISE, DEFAULT_FILTER_KALMAN_PROCESS_NOISE
+        )
+        current_filter_kalman_measurement_noise = self.config_entry.options.get(
+            CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+            DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE,
+        )
+        current_history_size = self.config_entry.options.get(
+            CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE
+        )
+        current_parameter_coalesce_window = self.config_entry.options.get(
+            CONF_PARAMETER_COALESCE_WINDOW, DEFAULT_PARAMETER_COALESCE_WINDOW
+        )
 
         options_schema = vol.Schema(
             {
@@ -182,6 +285,117 @@ class PIDControllerOptionsFlowHandler(OptionsFlow):
                     CONF_OUTPUT_ENTITY,
                     default=current_output_entity,
                 ): selector({"entity": {"multiple": False}}),
+                vol.Required(
+                    CONF_EXECUTION_MODE,
+                    default=current_execution_mode,
+                ): selector(
+                    {
+                        "select": {
+                            "options": [
+                                EXECUTION_MODE_INTERVAL,
+                                EXECUTION_MODE_INPUT_CHANGE,
+                                EXECUTION_MODE_HIGH_RATE,
+                            ],
+                            "translation_key": CONF_EXECUTION_MODE,
+                        }
+                    }
+                ),
+                vol.Required(
+                    CONF_LATE_TICK_POLICY,
+                    default=current_late_tick_policy,
+                ): selector(
+                    {
+                        "select": {
+                            "options": [
+                                LATE_TICK_REAL_DT,
+                                LATE_TICK_CLAMP_DT,
+                                LATE_TICK_SKIP,
+                            ],
+                            "translation_key": CONF_LATE_TICK_POLICY,
+                        }
+                    }
+                ),
+                vol.Required(
+                    CONF_MIN_INTERVAL,
+                    default=current_min_interval,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_MAX_STALENESS,
+                    default=current_max_staleness,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.01)),
+                vol.Required(
+                    CONF_OUTPUT_DEADBAND,
+                    default=current_output_deadband,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_OUTPUT_DEADBAND_RELATIVE,
+                    default=current_output_deadband_relative,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Required(
+                    CONF_OUTPUT_REFRESH_INTERVAL,
+                    default=current_output_refresh_interval,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_PUBLISH_EVERY_N_TICKS,
+                    default=current_publish_every_n_ticks,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_PUBLISH_MIN_CHANGE,
+                    default=current_publish_min_change,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_PUBLISH_MIN_CHANGE_RELATIVE,
+                    default=current_publish_min_change_relative,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Required(
+                    CONF_PUBLISH_MIN_INTERVAL,
+                    default=current_publish_min_interval,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_INPUT_FILTERS,
+                    default=current_input_filters,
+                ): selector(
+                    {
+                        "select": {
+                            "options": [
+                                FILTER_MEDIAN,
+                                FILTER_EMA,
+                                FILTER_LOWPASS,
+                                FILTER_KALMAN,
+                            ],
+                            "multiple": True,
+                            "translation_key": CONF_INPUT_FILTERS,
+                        }
+                    }
+                ),
+                vol.Required(
+                    CONF_FILTER_EMA_ALPHA,
+                    default=current_filter_ema_alpha,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.001, max=1)),
+                vol.Required(
+                    CONF_FILTER_MEDIAN_WINDOW,
+                    default=current_filter_median_window,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                vol.Required(
+                    CONF_FILTER_LOWPASS_TAU,
+                    default=current_filter_lowpass_tau,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_FILTER_KALMAN_PROCESS_NOISE,
+                    default=current_filter_kalman_process_noise,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_FILTER_KALMAN_MEASUREMENT_NOISE,
+                    default=current_filter_kalman_measurement_noise,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.000001)),
+                vol.Required(
+                    CONF_HISTORY_SIZE,
+                    default=current_history_size,
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100000)),
+                vol.Required(
+                    CONF_PARAMETER_COALESCE_WINDOW,
+                    default=current_parameter_coalesce_window,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
             }
         )
 
@@ -18,3 +18,71 @@ DEFAULT_OUTPUT_RANGE_MIN = 0.0
 DEFAULT_OUTPUT_RANGE_MAX = 100.0
 
 CONF_OUTPUT_ENTITY = "Output Entity"
+
+CONF_EXECUTION_MODE = "execution_mode"
+EXECUTION_MODE_INTERVAL = "interval"
+EXECUTION_MODE_INPUT_CHANGE = "input_change"
+EXECUTION_MODE_HIGH_RATE = "high_rate"
+DEFAULT_EXECUTION_MODE = EXECUTION_MODE_INTERVAL
+
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_STALENESS = "max_staleness"
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_MAX_STALENESS = 60.0
+
+CONF_OUTPUT_DEADBAND = "output_deadband"
+CONF_OUTPUT_DEADBAND_RELATIVE = "output_deadband_relative"
+CONF_OUTPUT_REFRESH_INTERVAL = "output_refresh_interval"
+DEFAULT_OUTPUT_DEADBAND = 0.0
+DEFAULT_OUTPUT_DEADBAND_RELATIVE = 0.0  # percent of the last written value
+DEFAULT_OUTPUT_REFRESH_INTERVAL = 300.0  # seconds, 0 disables the refresh
+
+# Dispatched with the entry_id after options were applied without a reload
+SIGNAL_OPTIONS_UPDATED = f"{DOMAIN}_options_updated_{{}}"
+# Sent with {key: value} of the parameters written by the set_parameters action
+SIGNAL_PARAMETERS_SET = f"{DOMAIN}_parameters_set_{{}}"
+
+CONF_PUBLISH_EVERY_N_TICKS = "publish_every_n_ticks"
+CONF_PUBLISH_MIN_CHANGE = "publish_min_change"
+CONF_PUBLISH_MIN_CHANGE_RELATIVE = "publish_min_change_relative"
+CONF_PUBLISH_MIN_INTERVAL = "publish_min_interval"
+DEFAULT_PUBLISH_EVERY_N_TICKS = 1
+DEFAULT_PUBLISH_MIN_CHANGE = 0.0
+DEFAULT_PUBLISH_MIN_CHANGE_RELATIVE = 0.0  # percent of the last published value
+DEFAULT_PUBLISH_MIN_INTERVAL = 0.0  # seconds
+
+CONF_LATE_TICK_POLICY = "late_tick_policy"
+LATE_TICK_SKIP = "skip"
+LATE_TICK_REAL_DT = "real_dt"
+LATE_TICK_CLAMP_DT = "clamp_dt"
+DEFAULT_LATE_TICK_POLICY = LATE_TICK_REAL_DT
+
+CONF_INPUT_FILTERS = "input_filters"
+CONF_FILTER_EMA_ALPHA = "filter_ema_alpha"
+CONF_FILTER_MEDIAN_WINDOW = "filter_median_window"
+CONF_FILTER_LOWPASS_TAU = "filter_lowpass_tau"
+CONF_FILTER_KALMAN_PROCESS_NOISE = "filter_kalman_process_noise"
+CONF_FILTER_KALMAN_MEASUREMENT_NOISE = "filter_kalman_measurement_noise"
+DEFAULT_INPUT_FILTERS: list[str] = []
+DEFAULT_FILTER_EMA_ALPHA = 0.3
+DEFAULT_FILTER_MEDIAN_WINDOW = 5
+DEFAULT_FILTER_LOWPASS_TAU = 10.0  # seconds
+DEFAULT_FILTER_KALMAN_PROCESS_NOISE = 0.01
+DEFAULT_FILTER_KALMAN_MEASUREMENT_NOISE = 1.0
+
+CONF_PARAMETER_COALESCE_WINDOW = "parameter_coalesce_window"
+# Parameter changes within this many seconds lead to one PID run, 0 runs on each
+DEFAULT_PARAMETER_COALESCE_WINDOW = 0.0
+
+CONF_HISTORY_SIZE = "history_size"
+DEFAULT_HISTORY_SIZE = 600  # ticks, 0 disables the history
+
+SERVICE_EXPORT_HISTORY = "export_history"
+SERVICE_SET_PARAMETERS = "set_parameters"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+START_MODE_OPTIONS = [
+    "Zero start",  # Simple and safe, but may cause jumps
+    "Last known value",  # Continuous, smooth resumption
+    "Startup value",  # User-defined default at startup
+]
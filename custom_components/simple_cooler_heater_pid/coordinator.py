@@ -2,11 +2,19 @@
 
 from datetime import timedelta
 import logging
+from time import perf_counter
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+from homeassistant.helpers.update_coordinator import (
+    REQUEST_REFRESH_DEFAULT_COOLDOWN,
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
 
-from .const import DOMAIN
+from .const import DEFAULT_LATE_TICK_POLICY, DOMAIN
+from .stats import TickStats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,20 +23,128 @@ class PIDDataCoordinator(DataUpdateCoordinator[float]):
     """Coordinator responsible for scheduling PID controller updates."""
 
     def __init__(
-        self, hass: HomeAssistant, name: str, update_method, interval: float = 10
+        self,
+        hass: HomeAssistant,
+        name: str,
+        update_method,
+        interval: float | None = 10,
+        coalesce_window: float = 0.0,
     ):
-        """Initialize the coordinator."""
+        """Initialize the coordinator.
+
+        With interval None the coordinator has no timer of its own and is
+        driven by the shared PIDScheduler instead. Refresh requests within
+        coalesce_window seconds of the first one lead to a single run at the
+        end of the window. Without a window a request runs right away, as
+        with the default debouncer of DataUpdateCoordinator.
+        """
+        self._refresh_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=coalesce_window or REQUEST_REFRESH_DEFAULT_COOLDOWN,
+            immediate=not coalesce_window,
+        )
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_{name}_coordinator",
-            update_interval=timedelta(seconds=interval),
+            update_interval=timedelta(seconds=interval) if interval else None,
+            request_refresh_debouncer=self._refresh_debouncer,
         )
         self.update_method = update_method
+        self._last_run: float | None = None
+        self._min_interval = 0.0
+        self._unsub_pending: CALLBACK_TYPE | None = None
+        self._unsub_input: CALLBACK_TYPE | None = None
+        # Loop time the pending run was scheduled for, None if not timed
+        self.tick_time: float | None = None
+        # What to do with ticks the scheduler delivers late
+        self.late_tick_policy = DEFAULT_LATE_TICK_POLICY
+        self.stats = TickStats()
+
+    @property
+    def coalesce_window(self) -> float:
+        """Return the window in which refresh requests are coalesced."""
+        if self._refresh_debouncer.immediate:
+            return 0.0
+        return self._refresh_debouncer.cooldown
+
+    @coalesce_window.setter
+    def coalesce_window(self, window: float) -> None:
+        """Change the window, taking effect from the next request."""
+        self._refresh_debouncer.cooldown = window or REQUEST_REFRESH_DEFAULT_COOLDOWN
+        self._refresh_debouncer.immediate = not window
+
+    @callback
+    def async_track_input(
+        self, entity_id: str, min_interval: float, max_staleness: float
+    ) -> CALLBACK_TYPE:
+        """Run the PID whenever entity_id reports a new value.
+
+        Runs are spaced at least min_interval seconds apart. The regular timer
+        is stretched to max_staleness so it only fires when the input has been
+        silent for that long. Calling it again replaces the previous input.
+        """
+        self._min_interval = min_interval
+        self.update_interval = timedelta(seconds=max_staleness)
+        if self._unsub_input is not None:
+            self._unsub_input()
+        self._unsub_input = async_track_state_change_event(
+            self.hass, entity_id, self._async_input_changed
+        )
+
+        @callback
+        def _async_unsub() -> None:
+            if self._unsub_input is not None:
+                self._unsub_input()
+                self._unsub_input = None
+            self._async_cancel_pending()
+
+        return _async_unsub
+
+    @callback
+    def _async_input_changed(self, event: Event) -> None:
+        """Schedule a PID run for a new input reading."""
+        new_state = event.data["new_state"]
+        old_state = event.data["old_state"]
+        if new_state is None or new_state.state in ("unknown", "unavailable"):
+            return
+        if old_state is not None and old_state.state == new_state.state:
+            return  # attribute-only change
+        if self._unsub_pending is not None:
+            return  # a run is already scheduled
+
+        wait = 0.0
+        if self._last_run is not None:
+            wait = self._last_run + self._min_interval - self.hass.loop.time()
+        if wait <= 0:
+            self.hass.async_create_task(self.async_refresh())
+        else:
+            _LOGGER.debug("Input changed, next PID run in %.2f seconds", wait)
+            self._unsub_pending = async_call_later(self.hass, wait, self._async_run)
+
+    async def _async_run(self, _now) -> None:
+        """Run a PID update that was held back by the minimum interval."""
+        self._unsub_pending = None
+        await self.async_refresh()
+
+    @callback
+    def _async_cancel_pending(self) -> None:
+        if self._unsub_pending is not None:
+            self._unsub_pending()
+            self._unsub_pending = None
 
     async def _async_update_data(self) -> float:
         """Perform the PID calculation and return the new output value."""
+        self._last_run = self.hass.loop.time()
+        # Off-schedule runs (parameter changes, startup) say nothing on jitter
+        timed = self.tick_time is not None
+        started = perf_counter()
+        failed = False
         try:
             return await self.update_method()
         except Exception as err:
+            failed = True
             raise UpdateFailed(f"PID update failed: {err}") from err
+        finally:
+            self.stats.record(self._last_run, perf_counter() - started, failed, timed)
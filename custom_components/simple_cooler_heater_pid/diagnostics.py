@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from typing import Any
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
@@ -12,15 +13,30 @@ async def async_get_config_entry_diagnostics(
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
     handle = entry.runtime_data.handle
+    coordinator = entry.runtime_data.coordinator
+    # Ticks are stamped with loop time, export them as UNIX timestamps
+    offset = time.time() - hass.loop.time()
 
     return {
         "entry_data": entry.as_dict(),
         "data": {
             "name": handle.name,
             "sensor_entity_id": handle.sensor_entity_id,
+            "input_pending": handle.input_pending,
             "input_range_min": handle.input_range_min,
             "input_range_max": handle.input_range_max,
             "output_range_min": handle.output_range_min,
             "output_range_max": handle.output_range_max,
+            "parameter_coalesce_window": handle.parameter_coalesce_window,
         },
+        "output": handle.output_stage.as_dict(),
+        "input_filters": handle.input_filter.names,
+        "publish": {
+            "every_n_ticks": handle.publish_policy.every_n_ticks,
+            "min_change": handle.publish_policy.min_change,
+            "min_change_relative": handle.publish_policy.min_change_relative,
+            "min_interval": handle.publish_policy.min_interval,
+        },
+        "ticks": coordinator.stats.as_dict() if coordinator is not None else None,
+        "history": handle.history.as_columns(offset),
     }
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity, DeviceInfo
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_PARAMETERS_SET
 from . import PIDDeviceHandle
 
 
@@ -21,7 +24,8 @@ class BasePIDEntity(Entity):
         """Initialize the base PID entity."""
         self.hass = hass
         self._entry = entry
-        self._handle = PIDDeviceHandle(hass, entry)
+        # All entities of an entry share the handle created at setup
+        self._handle: PIDDeviceHandle = entry.runtime_data.handle
         self._key = key
 
         # Common entity attributes
@@ -32,3 +36,27 @@ class BasePIDEntity(Entity):
             identifiers={(DOMAIN, entry.entry_id)},
             name=self._handle.name,
         )
+
+    def _publish_parameter(self, value) -> None:
+        """Push the current value into the shared parameter record."""
+        self._handle.params.update(self._key, value)
+
+    @callback
+    def _async_listen_parameters_set(self) -> CALLBACK_TYPE:
+        """Take this entity's value from the set_parameters action.
+
+        The entity has to provide _async_set_parameter(value), which stores
+        the value and writes the state without awaiting anything, so all
+        entities of a call change in the same loop iteration.
+        """
+
+        @callback
+        def _async_parameters_set(values: dict[str, Any]) -> None:
+            if self._key in values:
+                self._async_set_parameter(values[self._key])
+
+        return async_dispatcher_connect(
+            self.hass,
+            SIGNAL_PARAMETERS_SET.format(self._entry.entry_id),
+            _async_parameters_set,
+        )
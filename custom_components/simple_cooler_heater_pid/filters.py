@@ -0,0 +1,138 @@
+"""Streaming input filters applied between the input sensor and the PID."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Iterable
+
+FILTER_EMA = "ema"
+FILTER_MEDIAN = "median"
+FILTER_LOWPASS = "lowpass"
+FILTER_KALMAN = "kalman"
+
+
+class EMAFilter:
+    """Exponential moving average, alpha is the weight of a new sample."""
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, alpha: float) -> None:
+        self.alpha = alpha
+        self.value: float | None = None
+
+    def update(self, sample: float, now: float) -> float:
+        if self.value is None:
+            self.value = sample
+        else:
+            self.value += self.alpha * (sample - self.value)
+        return self.value
+
+
+class MovingMedianFilter:
+    """Median of the last window samples, kept in a ring buffer."""
+
+    __slots__ = ("_ring", "_sorted")
+
+    def __init__(self, window: int) -> None:
+        self._ring: deque[float] = deque(maxlen=max(window, 1))
+        # The samples of the ring, in sorted order
+        self._sorted: list[float] = []
+
+    def update(self, sample: float, now: float) -> float:
+        if len(self._ring) == self._ring.maxlen:
+            del self._sorted[bisect_left(self._sorted, self._ring[0])]
+        self._ring.append(sample)
+        insort(self._sorted, sample)
+        count = len(self._sorted)
+        middle = count // 2
+        if count % 2:
+            return self._sorted[middle]
+        return (self._sorted[middle - 1] + self._sorted[middle]) / 2
+
+
+class LowPassFilter:
+    """First-order low-pass with time constant tau (seconds).
+
+    Unlike the EMA the smoothing follows the real time between samples, so
+    irregular sample intervals are handled correctly.
+    """
+
+    __slots__ = ("tau", "value", "_last_time")
+
+    def __init__(self, tau: float) -> None:
+        self.tau = tau
+        self.value: float | None = None
+        self._last_time = 0.0
+
+    def update(self, sample: float, now: float) -> float:
+        if self.value is None:
+            self.value = sample
+        elif (dt := now - self._last_time) > 0:
+            self.value += dt / (self.tau + dt) * (sample - self.value)
+        self._last_time = now
+        return self.value
+
+
+class KalmanFilter:
+    """One-dimensional Kalman filter for a slowly changing value.
+
+    process_noise is how much the true value is expected to move between
+    samples, measurement_noise how noisy the sensor is (both variances).
+    """
+
+    __slots__ = ("process_noise", "measurement_noise", "value", "variance")
+
+    def __init__(self, process_noise: float, measurement_noise: float) -> None:
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.value: float | None = None
+        self.variance = 1.0
+
+    def update(self, sample: float, now: float) -> float:
+        if self.value is None:
+            self.value = sample
+            self.variance = self.measurement_noise
+            return sample
+        variance = self.variance + self.process_noise
+        gain = variance / (variance + self.measurement_noise)
+        self.value += gain * (sample - self.value)
+        self.variance = (1 - gain) * variance
+        return self.value
+
+
+class FilterChain:
+    """Filters applied one after the other; state is kept between ticks."""
+
+    __slots__ = ("names", "filters")
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        ema_alpha: float,
+        median_window: int,
+        lowpass_tau: float,
+        kalman_process_noise: float,
+        kalman_measurement_noise: float,
+    ) -> None:
+        """Build the chain in the order of names; unknown names are ignored."""
+        factories = {
+            FILTER_EMA: lambda: EMAFilter(ema_alpha),
+            FILTER_MEDIAN: lambda: MovingMedianFilter(int(median_window)),
+            FILTER_LOWPASS: lambda: LowPassFilter(lowpass_tau),
+            FILTER_KALMAN: lambda: KalmanFilter(
+                kalman_process_noise, kalman_measurement_noise
+            ),
+        }
+        self.names = [name for name in names if name in factories]
+        self.filters = [factories[name]() for name in self.names]
+
+    def __bool__(self) -> bool:
+        """Return True if the chain contains any filter."""
+        return bool(self.filters)
+
+    def update(self, sample: float, now: float) -> float:
+        """Feed a raw sample taken at loop time now and return the output."""
+        for stage in self.filters:
+            sample = stage.update(sample, now)
+        return sample
@@ -6,20 +6,18 @@ import logging
 
 from homeassistant.components.number import RestoreNumber
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import EntityCategory
 
 from .entity import BasePIDEntity
 from .const import (
-    CONF_INPUT_RANGE_MIN,
-    CONF_INPUT_RANGE_MAX,
-    CONF_OUTPUT_RANGE_MIN,
-    CONF_OUTPUT_RANGE_MAX,
     DEFAULT_INPUT_RANGE_MIN,
     DEFAULT_INPUT_RANGE_MAX,
     DEFAULT_OUTPUT_RANGE_MIN,
     DEFAULT_OUTPUT_RANGE_MAX,
+    SIGNAL_OPTIONS_UPDATED,
 )
 
 # Coordinator is used to centralize the data updates
@@ -132,6 +130,7 @@ class PIDParameterNumber(RestoreNumber):
         self._attr_native_step = desc["step"]
         self._attr_native_value = desc["default"]
         self._attr_entity_category = desc["entity_category"]
+        BasePIDEntity._publish_parameter(self, self._attr_native_value)
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
@@ -142,13 +141,20 @@ class PIDParameterNumber(RestoreNumber):
                 self._attr_native_value = self._attr_native_max_value
             else:
                 self._attr_native_value = last.native_value
+        BasePIDEntity._publish_parameter(self, self._attr_native_value)
+        self.async_on_remove(BasePIDEntity._async_listen_parameters_set(self))
 
     @property
     def native_value(self) -> float:
         return self._attr_native_value
 
     async def async_set_native_value(self, value: float) -> None:
+        self._async_set_parameter(value)
+
+    @callback
+    def _async_set_parameter(self, value: float) -> None:
         self._attr_native_value = value
+        BasePIDEntity._publish_parameter(self, value)
         self.async_write_ha_state()
 
 
@@ -168,24 +174,11 @@ class ControlParameterNumber(RestoreNumber):
         self._key = desc["key"]
 
         # Compute range limits based on key
-        opts = entry.options or {}
-        data = entry.data or {}
-        input_range_min = opts.get(
-            CONF_INPUT_RANGE_MIN,
-            data.get(CONF_INPUT_RANGE_MIN, DEFAULT_INPUT_RANGE_MIN),
-        )
-        input_range_max = opts.get(
-            CONF_INPUT_RANGE_MAX,
-            data.get(CONF_INPUT_RANGE_MAX, DEFAULT_INPUT_RANGE_MAX),
-        )
-        output_range_min = opts.get(
-            CONF_OUTPUT_RANGE_MIN,
-            data.get(CONF_OUTPUT_RANGE_MIN, DEFAULT_OUTPUT_RANGE_MIN),
-        )
-        output_range_max = opts.get(
-            CONF_OUTPUT_RANGE_MAX,
-            data.get(CONF_OUTPUT_RANGE_MAX, DEFAULT_OUTPUT_RANGE_MAX),
-        )
+        handle = self._handle
+        input_range_min = handle.input_range_min
+        input_range_max = handle.input_range_max
+        output_range_min = handle.output_range_min
+        output_range_max = handle.output_range_max
 
         if self._key == "setpoint":
             min_val, max_val = input_range_min, input_range_max
@@ -225,6 +218,7 @@ class ControlParameterNumber(RestoreNumber):
             self._attr_native_value = output_range_max
         else:
             _LOGGER.error("Unexpected error, unknown state in number.py")
+        BasePIDEntity._publish_parameter(self, self._attr_native_value)
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
@@ -235,11 +229,43 @@ class ControlParameterNumber(RestoreNumber):
                 self._attr_native_value = self._attr_native_max_value
             else:
                 self._attr_native_value = last.native_value
+        BasePIDEntity._publish_parameter(self, self._attr_native_value)
+        self.async_on_remove(BasePIDEntity._async_listen_parameters_set(self))
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OPTIONS_UPDATED.format(self._entry.entry_id),
+                self._async_options_updated,
+            )
+        )
+
+    @callback
+    def _async_options_updated(self) -> None:
+        """Follow changed input/output ranges without reloading the entry."""
+        handle = self._handle
+        if self._key == "setpoint":
+            min_val, max_val = handle.input_range_min, handle.input_range_max
+        elif self._key in ("starting_output", "output_min", "output_max"):
+            min_val, max_val = handle.output_range_min, handle.output_range_max
+        else:
+            return
+        self._attr_native_min_value = min_val
+        self._attr_native_max_value = max_val
+        value = min(max(self._attr_native_value, min_val), max_val)
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            BasePIDEntity._publish_parameter(self, value)
+        self.async_write_ha_state()
 
     @property
     def native_value(self) -> float:
         return self._attr_native_value
 
     async def async_set_native_value(self, value: float) -> None:
+        self._async_set_parameter(value)
+
+    @callback
+    def _async_set_parameter(self, value: float) -> None:
         self._attr_native_value = value
+        BasePIDEntity._publish_parameter(self, value)
         self.async_write_ha_state()
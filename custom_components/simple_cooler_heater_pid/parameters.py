@@ -0,0 +1,73 @@
+"""Parameter record shared between the PID entities and the control loop."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+
+PARAMETER_KEYS = (
+    "kp",
+    "ki",
+    "kd",
+    "setpoint",
+    "starting_output",
+    "sample_time",
+    "output_min",
+    "output_max",
+    "auto_mode",
+    "proportional_on_measurement",
+    "windup_protection",
+    "cooling_mode",
+    "start_mode",
+)
+
+
+class PIDParameters:
+    """Typed snapshot of the current PID parameters.
+
+    The number, switch and select entities push their values in here whenever
+    they change, so the control loop only has to read plain attributes.
+    Every assignment is remembered, so the loop can apply only the parameters
+    that changed since its last tick.
+    """
+
+    __slots__ = (*PARAMETER_KEYS, "_changed")
+
+    def __init__(self) -> None:
+        """Initialize with the same fallbacks the entity lookups used."""
+        object.__setattr__(self, "_changed", set())
+        self.kp: float | None = None
+        self.ki: float | None = None
+        self.kd: float | None = None
+        self.setpoint: float | None = None
+        self.starting_output: float | None = None
+        self.sample_time: float | None = None
+        self.output_min: float | None = None
+        self.output_max: float | None = None
+        # Switches default to True when their entity is missing
+        self.auto_mode: bool = True
+        self.proportional_on_measurement: bool = True
+        self.windup_protection: bool = True
+        self.cooling_mode: bool = True
+        self.start_mode: str | None = None
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        """Set a parameter and mark it as changed."""
+        object.__setattr__(self, key, value)
+        self._changed.add(key)
+
+    def update(self, key: str, value: Any) -> None:
+        """Store a value pushed by an entity; unknown keys are ignored."""
+        if key in PARAMETER_KEYS and getattr(self, key) != value:
+            setattr(self, key, value)
+
+    def pop_changes(self) -> set[str]:
+        """Return the parameters changed since the last call and reset them."""
+        changed = self._changed
+        object.__setattr__(self, "_changed", set())
+        return changed
+
+    def mark_changed(self, keys: Iterable[str] = PARAMETER_KEYS) -> None:
+        """Mark parameters as changed again, by default all of them."""
+        self._changed.update(keys)
@@ -0,0 +1,108 @@
+"""Persistence of the PID controller state across restarts."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from . import PIDDeviceHandle
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Longest time a tick can go unsaved; Home Assistant also writes pending
+# data when it shuts down
+SAVE_DELAY = 30
+
+# simple_pid attributes making up the controller state
+PID_STATE_ATTRS = (
+    "_proportional",
+    "_integral",
+    "_derivative",
+    "_last_input",
+    "_last_error",
+    "_last_output",
+    "_auto_mode",
+)
+
+
+def snapshot_pid_state(handle: PIDDeviceHandle) -> dict[str, Any] | None:
+    """Return the state of the handle's PID, or None if it has none yet."""
+    pid = getattr(handle, "pid", None)
+    if pid is None:
+        return None
+    return {
+        "pid": {
+            attr.lstrip("_"): getattr(pid, attr)
+            for attr in PID_STATE_ATTRS
+            if hasattr(pid, attr)
+        },
+        "last_known_output": handle.last_known_output,
+    }
+
+
+def restore_pid_state(handle: PIDDeviceHandle, data: dict[str, Any]) -> None:
+    """Load a snapshot into the handle's PID before its first tick."""
+    pid = handle.pid
+    for attr in PID_STATE_ATTRS:
+        name = attr.lstrip("_")
+        if name in data.get("pid", {}):
+            setattr(pid, attr, data["pid"][name])
+    # The stored time belongs to the previous run; count from now instead
+    pid._last_time = pid.time_fn()
+    handle.last_known_output = data.get("last_known_output")
+
+
+class PIDStateStore:
+    """Debounced storage of one controller's state.
+
+    Saving is requested after every tick, but at most one write is pending
+    at a time and it always contains the state at the moment it runs.
+    """
+
+    __slots__ = ("_handle", "_store", "_pending")
+
+    def __init__(self, hass: HomeAssistant, handle: PIDDeviceHandle) -> None:
+        """Initialize the store for the handle's config entry."""
+        self._handle = handle
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{handle.entry.entry_id}"
+        )
+        self._pending = False
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the saved state, or None if there is none."""
+        return await self._store.async_load()
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the state within SAVE_DELAY seconds."""
+        if self._pending:
+            # Rescheduling would postpone the write for as long as ticks come
+            return
+        self._pending = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        """Save the state immediately, e.g. when the entry is unloaded."""
+        if (data := self._data_to_save()) is not None:
+            await self._store.async_save(data)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any] | None:
+        self._pending = False
+        data = snapshot_pid_state(self._handle)
+        _LOGGER.debug("Saving state of %s: %s", self._handle.name, data)
+        return data
+
+
+async def async_remove_pid_state(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the saved state of a removed config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}").async_remove()
@@ -0,0 +1,78 @@
+"""State publication policy for the PID sensors."""
+
+from __future__ import annotations
+
+
+class PublishPolicy:
+    """How often the PID sensors write their state.
+
+    every_n_ticks publishes at most every N coordinator updates, min_change
+    and min_change_relative (percent of the last published value) require a
+    significant change and min_interval (seconds) rate limits the writes.
+    The defaults publish on every tick.
+    """
+
+    __slots__ = ("every_n_ticks", "min_change", "min_change_relative", "min_interval")
+
+    def __init__(
+        self,
+        every_n_ticks: int = 1,
+        min_change: float = 0.0,
+        min_change_relative: float = 0.0,
+        min_interval: float = 0.0,
+    ) -> None:
+        """Initialize the policy."""
+        self.every_n_ticks = every_n_ticks
+        self.min_change = min_change
+        self.min_change_relative = min_change_relative
+        self.min_interval = min_interval
+
+
+class StateDecimator:
+    """Decide per entity whether a coordinator update is written as state.
+
+    The control loop keeps running at full rate; only the state writes (and
+    with them recorder rows and bus events) are thinned out.
+    """
+
+    __slots__ = ("policy", "published", "suppressed", "_ticks", "_last", "_last_time")
+
+    def __init__(self, policy: PublishPolicy) -> None:
+        """Initialize the decimator for one entity."""
+        self.policy = policy
+        self.published = 0
+        self.suppressed = 0
+        self._ticks = 0
+        # (value, available) of the last written state
+        self._last: tuple[float | None, bool] | None = None
+        self._last_time = 0.0
+
+    def should_publish(self, value: float | None, available: bool, now: float) -> bool:
+        """Return True if the new value has to be written at loop time now."""
+        policy = self.policy
+        self._ticks += 1
+        last = self._last
+        if (
+            last is not None
+            and last[1] == available
+            and (last[0] is None) == (value is None)
+        ):
+            # Only thin out plain value updates, never availability changes
+            insignificant = False
+            if value is not None and (policy.min_change or policy.min_change_relative):
+                threshold = max(
+                    policy.min_change, abs(last[0]) * policy.min_change_relative / 100
+                )
+                insignificant = abs(value - last[0]) <= threshold
+            if (
+                insignificant
+                or self._ticks < policy.every_n_ticks
+                or now - self._last_time < policy.min_interval
+            ):
+                self.suppressed += 1
+                return False
+        self._ticks = 0
+        self._last = (value, available)
+        self._last_time = now
+        self.published += 1
+        return True
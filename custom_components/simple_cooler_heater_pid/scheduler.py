@@ -0,0 +1,256 @@
+"""Shared scheduler driving the PID coordinators of all config entries."""
+
+from __future__ import annotations
+
+from asyncio import Task, TimerHandle
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, LATE_TICK_SKIP
+
+if TYPE_CHECKING:
+    from .coordinator import PIDDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fraction used to spread the phases of the sample time groups
+_PHASE_STEP = 0.6180339887
+
+# A tick is late once it runs this fraction of a sample time after its deadline
+LATE_TOLERANCE = 0.5
+
+
+@callback
+def _async_tick_is_late(
+    coordinator: PIDDataCoordinator, lateness: float, sample_time: float
+) -> bool:
+    """Record a late tick and return True if the coordinator skips it."""
+    if lateness <= sample_time * LATE_TOLERANCE:
+        return False
+    stats = coordinator.stats
+    stats.late += 1
+    stats.missed += int(lateness // sample_time)
+    if coordinator.late_tick_policy == LATE_TICK_SKIP:
+        stats.skipped += 1
+        return True
+    return False
+
+
+class _SampleTimeGroup:
+    """Coordinators that share one sample time and one timer."""
+
+    __slots__ = ("sample_time", "members", "deadline", "timer", "task")
+
+    def __init__(self, sample_time: float) -> None:
+        self.sample_time = sample_time
+        self.members: list[PIDDataCoordinator] = []
+        self.deadline = 0.0
+        self.timer: TimerHandle | None = None
+        self.task: Task | None = None
+
+
+class PIDScheduler:
+    """Run all PID coordinators from one timer per distinct sample time.
+
+    Coordinators are grouped by sample time and every group is refreshed from
+    a single batched callback. Groups get different phases so they do not all
+    wake up in the same loop iteration. Each coordinator still gets its own
+    refresh, so results, failures and listeners stay per entry.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._groups: dict[float, _SampleTimeGroup] = {}
+        self._sample_times: dict[PIDDataCoordinator, float] = {}
+        self._phase = 0.0
+
+    @callback
+    def async_add(self, coordinator: PIDDataCoordinator, sample_time: float) -> None:
+        """Schedule coordinator every sample_time seconds, moving it if needed."""
+        current = self._sample_times.get(coordinator)
+        if current == sample_time:
+            return
+        if current is not None:
+            self._async_leave(coordinator, current)
+            _LOGGER.debug(
+                "Moving %s from %.2f to %.2f seconds",
+                coordinator.name,
+                current,
+                sample_time,
+            )
+
+        if (group := self._groups.get(sample_time)) is None:
+            group = self._groups[sample_time] = _SampleTimeGroup(sample_time)
+            # The first tick comes somewhat early so groups that are created
+            # together do not share a phase
+            offset = sample_time * self._phase / 2
+            self._phase = (self._phase + _PHASE_STEP) % 1.0
+            group.deadline = self.hass.loop.time() + sample_time - offset
+            self._async_schedule(group)
+        group.members.append(coordinator)
+        self._sample_times[coordinator] = sample_time
+
+    @callback
+    def async_remove(self, coordinator: PIDDataCoordinator) -> None:
+        """Stop scheduling coordinator."""
+        if (current := self._sample_times.get(coordinator)) is not None:
+            self._async_leave(coordinator, current)
+        if not self._sample_times and self.hass.data.get(DOMAIN) is self:
+            del self.hass.data[DOMAIN]
+
+    @property
+    def group_count(self) -> int:
+        """Return the number of timers currently in use."""
+        return len(self._groups)
+
+    @callback
+    def _async_leave(self, coordinator: PIDDataCoordinator, sample_time: float) -> None:
+        del self._sample_times[coordinator]
+        group = self._groups[sample_time]
+        group.members.remove(coordinator)
+        if not group.members:
+            if group.timer is not None:
+                group.timer.cancel()
+            del self._groups[sample_time]
+
+    @callback
+    def _async_schedule(self, group: _SampleTimeGroup) -> None:
+        if group.timer is not None:
+            group.timer.cancel()
+        group.timer = self.hass.loop.call_at(group.deadline, self._async_tick, group)
+
+    @callback
+    def _async_tick(self, group: _SampleTimeGroup) -> None:
+        """Refresh all coordinators of a group and schedule its next tick."""
+        now = self.hass.loop.time()
+        lateness = now - group.deadline
+        # Realign after a stall instead of firing all missed deadlines at once
+        periods = max(int(lateness // group.sample_time), 0) + 1
+        group.deadline += periods * group.sample_time
+        self._async_schedule(group)
+        if group.task is not None and not group.task.done():
+            # The previous batch is still running, do not pile up behind it
+            _LOGGER.debug(
+                "Previous %.2fs tick still running, skipped", group.sample_time
+            )
+            for coordinator in group.members:
+                coordinator.stats.skipped += 1
+            return
+        members = [
+            coordinator
+            for coordinator in group.members
+            if not _async_tick_is_late(coordinator, lateness, group.sample_time)
+        ]
+        if lateness > group.sample_time * LATE_TOLERANCE:
+            _LOGGER.debug(
+                "%.2fs tick %.3f seconds late, running %d of %d controllers",
+                group.sample_time,
+                lateness,
+                len(members),
+                len(group.members),
+            )
+        for coordinator in members:
+            coordinator.tick_time = now
+        group.task = self.hass.async_create_task(
+            self._async_run(members),
+            f"{DOMAIN} {group.sample_time}s tick",
+        )
+
+    async def _async_run(self, members: list[PIDDataCoordinator]) -> None:
+        for coordinator in members:
+            await coordinator.async_refresh()
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> PIDScheduler:
+    """Return the scheduler shared by all config entries."""
+    if (scheduler := hass.data.get(DOMAIN)) is None:
+        scheduler = hass.data[DOMAIN] = PIDScheduler(hass)
+    return scheduler
+
+
+class HighRateLoop:
+    """Dedicated timer for one coordinator with sub-second sample times.
+
+    Ticks are scheduled on absolute deadlines, so the error of one wake-up
+    does not carry over into the next. If a deadline passes while the previous
+    run is still busy, or the loop woke up a full period late, the tick is
+    counted and the schedule is realigned instead of bursting.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: PIDDataCoordinator, sample_time: float
+    ) -> None:
+        """Initialize the loop, call async_start to run it."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.sample_time = sample_time
+        self._deadline = 0.0
+        self._timer: TimerHandle | None = None
+        self._task: Task | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start ticking one sample time from now."""
+        self._deadline = self.hass.loop.time() + self.sample_time
+        self._async_schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop ticking and cancel a run still in progress."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def async_set_sample_time(self, sample_time: float) -> None:
+        """Change the sample time, starting from the last tick."""
+        if sample_time == self.sample_time:
+            return
+        _LOGGER.debug(
+            "High-rate loop of %s now every %.3f seconds",
+            self.coordinator.name,
+            sample_time,
+        )
+        self._deadline += sample_time - self.sample_time
+        self.sample_time = sample_time
+        if self._timer is not None:
+            self._async_schedule()
+
+    @callback
+    def _async_schedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self.hass.loop.call_at(self._deadline, self._async_tick)
+
+    @callback
+    def _async_tick(self) -> None:
+        """Run one PID evaluation and schedule the next deadline."""
+        now = self.hass.loop.time()
+        lateness = now - self._deadline
+        missed = max(int(lateness // self.sample_time), 0)
+        if missed:
+            _LOGGER.debug(
+                "High-rate loop of %s is %d ticks behind", self.coordinator.name, missed
+            )
+        # Realign instead of firing all missed deadlines in a burst
+        self._deadline += (missed + 1) * self.sample_time
+        self._async_schedule()
+
+        if self._task is not None and not self._task.done():
+            self.coordinator.stats.overruns += 1
+            return
+        if _async_tick_is_late(self.coordinator, lateness, self.sample_time):
+            return
+        # The PID gets the real time since its last run, not the nominal one
+        self.coordinator.tick_time = now
+        self._task = self.hass.async_create_task(
+            self.coordinator.async_refresh(),
+            f"{self.coordinator.name} high-rate tick",
+        )
@@ -1,15 +1,11 @@
 from homeassistant.components.select import SelectEntity
+from homeassistant.core import callback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.entity import EntityCategory
 
+from .const import START_MODE_OPTIONS
 from .entity import BasePIDEntity
 
-START_MODE_OPTIONS = [
-    "Zero start",  # Simple and safe, but may cause jumps
-    "Last known value",  # Continuous, smooth resumption
-    "Startup value",  # User-defined default at startup
-]
-
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the PID start mode select entity."""
@@ -28,12 +24,18 @@ class PIDStartModeSelect(BasePIDEntity, SelectEntity, RestoreEntity):
         self._attr_current_option = START_MODE_OPTIONS[0]
         self._attr_entity_category = EntityCategory.CONFIG
         self.coordinator = coordinator  # if needed later
+        self._publish_parameter(self._attr_current_option)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         if option in self._attr_options:
-            self._attr_current_option = option
-            self.async_write_ha_state()
+            self._async_set_parameter(option)
+
+    @callback
+    def _async_set_parameter(self, option: str) -> None:
+        self._attr_current_option = option
+        self._publish_parameter(option)
+        self.async_write_ha_state()
 
     async def async_added_to_hass(self):
         """Restore previous state."""
@@ -42,3 +44,5 @@ class PIDStartModeSelect(BasePIDEntity, SelectEntity, RestoreEntity):
             last_state := await self.async_get_last_state()
         ) and last_state.state in self._attr_options:
             self._attr_current_option = last_state.state
+        self._publish_parameter(self._attr_current_option)
+        self.async_on_remove(self._async_listen_parameters_set())
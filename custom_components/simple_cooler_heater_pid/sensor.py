@@ -6,27 +6,36 @@ import logging
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.restore_state import RestoreEntity
 
-from datetime import timedelta
 from simple_pid import PID
 from typing import Any
 
 from . import PIDDeviceHandle
 from .entity import BasePIDEntity
 from .coordinator import PIDDataCoordinator
+from .scheduler import HighRateLoop, async_get_scheduler
+from .persistence import restore_pid_state
+from .publish import StateDecimator
+from .tick import PIDTick
 
 from .const import (
-    CONF_OUTPUT_ENTITY,
+    EXECUTION_MODE_INTERVAL,
+    EXECUTION_MODE_INPUT_CHANGE,
+    EXECUTION_MODE_HIGH_RATE,
+    LATE_TICK_REAL_DT,
 )
 
 # Coordinator is used to centralize the data updates
 PARALLEL_UPDATES = 0
 
+# Interval used until the Sample Time number has been read
+DEFAULT_SAMPLE_TIME = 10.0
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -42,152 +51,130 @@ async def async_setup_entry(
     handle.pid = PID(1.0, 0.1, 0.05, setpoint=50, sample_time=None, auto_mode=False)
 
     handle.pid.output_limits = (-10.0, 10.0)
-    handle.last_contributions = (0, 0, 0, 0)
+    # A fresh PID has none of the current parameters yet
+    handle.params.mark_changed()
+    handle.last_tick = None
     handle.last_known_output = None
+    # Continue where the previous run stopped, before the first tick
+    stored = await handle.state_store.async_load()
+    restored = stored is not None
+    if restored:
+        _LOGGER.debug("Restoring PID state of %s: %s", handle.name, stored)
+        restore_pid_state(handle, stored)
 
     async def update_pid():
         """Update the PID output using current sensor and parameter values."""
+        # Time of this evaluation, as seen by the loop that triggered it.
+        # Taken first, so a tick that fails does not leave it to the next run
+        now = coordinator.tick_time
+        coordinator.tick_time = None
+        timed = now is not None
+
         input_value = handle.get_input_sensor_value()
         if input_value is None:
+            if handle.input_pending:
+                raise ValueError(f"Waiting for input sensor {handle.sensor_entity_id}")
             raise ValueError("Input sensor not available")
 
-        # Read parameters from UI
-        cooling_mode = handle.get_switch("cooling_mode")
-
-        if cooling_mode:
-            # Invert PID parameters for cooling mode
-            _LOGGER.debug("Cooling mode enabled, inverting PID parameters")
-            kp = -1 * handle.get_number("kp")
-            ki = -1 * handle.get_number("ki")
-            kd = -1 * handle.get_number("kd")  
-        else:  
-            # Normal PID parameters
-            _LOGGER.debug("Cooling mode disabled, using normal PID parameters")
-            kp = handle.get_number("kp")
-            ki = handle.get_number("ki")
-            kd = handle.get_number("kd")
-        setpoint = handle.get_number("setpoint")
-        starting_output = handle.get_number("starting_output")
-        start_mode = handle.get_select("start_mode")
-        sample_time = handle.get_number("sample_time")
-        out_min = handle.get_number("output_min")
-        out_max = handle.get_number("output_max")
-        auto_mode = handle.get_switch("auto_mode")
-        p_on_m = handle.get_switch("proportional_on_measurement")
-        windup_protection = handle.get_switch("windup_protection")
-
-
-        # adapt PID settings
-        handle.pid.tunings = (kp, ki, kd)
-        handle.pid.setpoint = setpoint
-
-        if windup_protection:
-            handle.pid.output_limits = (out_min, out_max)
-        else:
-            handle.pid.output_limits = (None, None)
+        # Parameters are pushed into the handle by the UI entities, only
+        # the ones that changed since the last tick are applied to the PID
+        params = handle.params
+        changed = params.pop_changes()
+        setpoint = params.setpoint
 
-        _LOGGER.debug("Start mode = %s (type: %s)", start_mode, type(start_mode))
-        if not handle.pid.auto_mode and auto_mode:
-            if start_mode == "Zero start":
-                handle.pid.set_auto_mode(True, 0)
-            elif start_mode == "Last known value":
-                handle.pid.set_auto_mode(True, handle.last_known_output)
-            elif start_mode == "Startup value":
-                handle.pid.set_auto_mode(True, starting_output)
-            else:
-                handle.pid.set_auto_mode(True)
+        if changed:
+            try:
+                _apply_parameters(handle, changed)
+            except Exception:
+                # Retry them on the next tick instead of losing them
+                params.mark_changed(changed)
+                raise
+            if "sample_time" in changed:
+                if handle.execution_mode == EXECUTION_MODE_INTERVAL:
+                    # no-op unless the sample time changed
+                    scheduler.async_add(coordinator, params.sample_time)
+                    coordinator.stats.expected_interval = params.sample_time
+                elif high_rate_loop is not None:
+                    high_rate_loop.async_set_sample_time(params.sample_time)
+                    coordinator.stats.expected_interval = params.sample_time
+
+        if not timed:
+            now = hass.loop.time()
+
+        raw_input = input_value
+        if handle.input_filter:
+            input_value = handle.input_filter.update(raw_input, now)
+
+        dt = None
+        if timed and handle.last_tick is not None:
+            # Feed the measured time since the last run instead of letting
+            # simple_pid sample its own clock after the task got scheduled
+            dt = now - handle.last_tick.timestamp
+            if coordinator.late_tick_policy != LATE_TICK_REAL_DT and (
+                params.sample_time
+            ):
+                # Do not integrate over the time lost to a late or skipped tick
+                dt = min(dt, params.sample_time)
+            if dt <= 0:
+                dt = None
+        elif restored and handle.last_tick is None and params.sample_time:
+            # First tick after a restore: integrate over one sample time, not
+            # over the time since the restore, so the I and D terms continue
+            # where they stopped
+            dt = params.sample_time
+
+        if dt is None:
+            output = handle.pid(input_value)
         else:
-            handle.pid.auto_mode = auto_mode
+            output = handle.pid(input_value, dt=dt)
 
-        handle.pid.proportional_on_measurement = p_on_m
-
-        output = handle.pid(input_value)
-        
-        #if cooling_mode:
+        # if cooling_mode:
         #    output = out_max + out_min - output
 
         # save last know output
         handle.last_known_output = output
 
-        # save last I contribution
-        last_i = handle.last_contributions[1]
-
-        # save all latest contributions
-        handle.last_contributions = (
-            handle.pid.components[0],
-            handle.pid.components[1],
-            handle.pid.components[2],
-            handle.pid.components[1] - last_i,
-        )
-
-        _LOGGER.debug(
-            "PID input=%s setpoint=%s kp=%s ki=%s kd=%s => output=%s [P=%s, I=%s, D=%s, dI=%s]",
-            input_value,
-            handle.pid.setpoint,
-            handle.pid.Kp,
-            handle.pid.Ki,
-            handle.pid.Kd,
-            output,
-            handle.last_contributions[0],
-            handle.last_contributions[1],
-            handle.last_contributions[2],
-            handle.last_contributions[3],
-        )
-
-        if coordinator.update_interval.total_seconds() != sample_time:
-            _LOGGER.debug("Updating coordinator interval to %.2f seconds", sample_time)
-            coordinator.update_interval = timedelta(seconds=sample_time)
-
-        output_entity_id = entry.options.get(CONF_OUTPUT_ENTITY) or entry.data.get(
-            CONF_OUTPUT_ENTITY
+        profile = handle.get_actuator_profile()
+        if profile is not None and profile.service is not None:
+            output = profile.convert(output)
+
+        # Publish everything this tick used and produced in one record
+        p_term, i_term, d_term = handle.pid.components
+        last_tick = handle.last_tick
+        handle.last_tick = PIDTick(
+            timestamp=now,
+            input=input_value,
+            setpoint=setpoint,
+            error=input_value - setpoint if setpoint is not None else None,
+            p=p_term,
+            i=i_term,
+            d=d_term,
+            i_delta=i_term - (last_tick.i if last_tick is not None else 0),
+            output=output,
+            raw_input=raw_input,
         )
 
-        if output_entity_id:
-            state = hass.states.get(output_entity_id)
-            accepts_integer = False  # default
-
-            if state is not None:
-                attrs = state.attributes
-                step_value = None
-                for key, value in attrs.items():
-                    if "step" in key.lower():
-                        step_value = value
-                        break  # prendi il primo attributo che contiene 'step'
-
-                if isinstance(step_value, (int, float)):
-                    accepts_integer = step_value >= 1
-
+        handle.history.append(handle.last_tick)
+        handle.state_store.async_schedule_save()
+        _LOGGER.debug("PID tick %s", handle.last_tick)
+
+        if profile is not None:
+            if profile.service is None:
+                return output
+            output_entity_id = profile.entity_id
+            domain = profile.domain
+            service = profile.service
+            service_data = profile.service_data(output)
+
+            if not handle.output_stage.should_write(
+                output_entity_id, output, hass.loop.time()
+            ):
                 _LOGGER.debug(
-                    "Output entity %s has step-like attribute=%s -> accepts_integer=%s",
+                    "Output %s for %s within deadband, write skipped",
+                    output,
                     output_entity_id,
-                    step_value,
-                    accepts_integer,
                 )
-            else:
-                _LOGGER.warning("State for entity %s not found", output_entity_id)
-
-            if accepts_integer:
-                output = round(output)    
-            
-            domain = output_entity_id.split(".")[0]
-            service_data = {
-                "entity_id": output_entity_id,
-            }
-
-            if domain in ("number", "input_number"):
-                service = "set_value"
-                service_data["value"] = output
-            elif domain == "fan":
-                service = "set_percentage"
-                # converti il valore in percentuale (assumendo che output sia normalizzato)
-                output = max(0, min(output, 100))  # clamp
-                service_data["percentage"] = output
-            elif domain == "light":
-                service = "turn_on"
-                service_data["brightness_pct"] = max(0, min(output, 100))
-            else:
-                _LOGGER.warning("Output entity domain %s not supported", domain)
-                return output  # o continua in base al tuo caso
+                return output
 
             _LOGGER.debug(
                 "Setting PID output %.2f to entity %s via %s.%s",
@@ -197,13 +184,9 @@ async def async_setup_entry(
                 service,
             )
 
-            hass.async_create_task(
-                hass.services.async_call(
-                    domain,
-                    service,
-                    service_data,
-                    blocking=False,
-                )
+            # Waits behind a slow write, replacing an older pending value
+            handle.output_stage.queue(hass, output_entity_id).async_write(
+                domain, service, service_data
             )
 
         return output
@@ -211,9 +194,35 @@ async def async_setup_entry(
     # Setup Coordinator
     if entry.runtime_data.coordinator is None:
         entry.runtime_data.coordinator = PIDDataCoordinator(
-            hass, handle.name, update_pid, interval=10
+            hass,
+            handle.name,
+            update_pid,
+            interval=(
+                10 if handle.execution_mode == EXECUTION_MODE_INPUT_CHANGE else None
+            ),
+            coalesce_window=handle.parameter_coalesce_window,
         )
     coordinator = entry.runtime_data.coordinator
+    coordinator.late_tick_policy = handle.late_tick_policy
+    scheduler = async_get_scheduler(hass)
+    high_rate_loop: HighRateLoop | None = None
+
+    if handle.execution_mode == EXECUTION_MODE_INTERVAL:
+        # Ticks come from the scheduler shared by all controllers
+        scheduler.async_add(coordinator, DEFAULT_SAMPLE_TIME)
+        entry.async_on_unload(lambda: scheduler.async_remove(coordinator))
+    elif handle.execution_mode == EXECUTION_MODE_HIGH_RATE:
+        # Own drift-free timer for fast loops
+        high_rate_loop = HighRateLoop(hass, coordinator, DEFAULT_SAMPLE_TIME)
+        high_rate_loop.async_start()
+        entry.async_on_unload(high_rate_loop.async_stop)
+    elif handle.execution_mode == EXECUTION_MODE_INPUT_CHANGE:
+        # Run on new input readings instead of a fixed sample time
+        entry.async_on_unload(
+            coordinator.async_track_input(
+                handle.sensor_entity_id, handle.min_interval, handle.max_staleness
+            )
+        )
 
     # Wait for HA to finish starting
     async def start_refresh(_: Any) -> None:
@@ -238,40 +247,63 @@ async def async_setup_entry(
             ),
             PIDContributionSensor(hass, entry, "error", "Error", coordinator),
             PIDContributionSensor(hass, entry, "pid_i_delta", "I delta", coordinator),
+            PIDContributionSensor(
+                hass, entry, "filtered_input", "Filtered input", coordinator
+            ),
+            PIDStatsSensor(
+                hass, entry, "tick_latency_p95", "Tick latency p95", coordinator
+            ),
+            PIDStatsSensor(hass, entry, "tick_jitter", "Tick jitter", coordinator),
+            PIDStatsSensor(hass, entry, "ticks_failed", "Failed ticks", coordinator),
+            PIDStatsSensor(hass, entry, "ticks_skipped", "Skipped ticks", coordinator),
+            PIDStatsSensor(
+                hass, entry, "writes_suppressed", "Suppressed writes", coordinator
+            ),
         ]
     )
 
-    # Put listeners on inputs
-    def make_listener(entity_id: str):
-        def _listener(event):
-            if event.data.get("entity_id") == entity_id:
-                _LOGGER.debug("Update detected on %s", entity_id)
-                coordinator.async_request_refresh()
-
-        return _listener
-
-    for key in [
-        "kp",
-        "ki",
-        "kd",
-        "setpoint",
-        "output_min",
-        "output_max",
-        "sample_time",
-    ]:
-        hass.bus.async_listen(
-            "state_changed", make_listener(f"number.{entry.entry_id}_{key}")
-        )
 
-    for key in ["auto_mode", "proportional_on_measurement", "windup_protection"]:
-        hass.bus.async_listen(
-            "state_changed", make_listener(f"switch.{entry.entry_id}_{key}")
-        )
+def _apply_parameters(handle: PIDDeviceHandle, changed: set[str]) -> None:
+    """Push the changed parameters into the PID instance."""
+    params = handle.params
+    pid = handle.pid
+    _LOGGER.debug("Applying changed PID parameters %s", sorted(changed))
 
-    for key in ["start_mode"]:
-        hass.bus.async_listen(
-            "state_changed", make_listener(f"select.{entry.entry_id}_{key}")
-        )
+    if changed & {"kp", "ki", "kd", "cooling_mode"}:
+        if params.cooling_mode:
+            # Invert PID parameters for cooling mode
+            _LOGGER.debug("Cooling mode enabled, inverting PID parameters")
+            pid.tunings = (-1 * params.kp, -1 * params.ki, -1 * params.kd)
+        else:
+            _LOGGER.debug("Cooling mode disabled, using normal PID parameters")
+            pid.tunings = (params.kp, params.ki, params.kd)
+
+    if "setpoint" in changed:
+        pid.setpoint = params.setpoint
+
+    if changed & {"output_min", "output_max", "windup_protection"}:
+        if params.windup_protection:
+            pid.output_limits = (params.output_min, params.output_max)
+        else:
+            pid.output_limits = (None, None)
+
+    if "auto_mode" in changed:
+        start_mode = params.start_mode
+        _LOGGER.debug("Start mode = %s (type: %s)", start_mode, type(start_mode))
+        if not pid.auto_mode and params.auto_mode:
+            if start_mode == "Zero start":
+                pid.set_auto_mode(True, 0)
+            elif start_mode == "Last known value":
+                pid.set_auto_mode(True, handle.last_known_output)
+            elif start_mode == "Startup value":
+                pid.set_auto_mode(True, params.starting_output)
+            else:
+                pid.set_auto_mode(True)
+        else:
+            pid.auto_mode = params.auto_mode
+
+    if "proportional_on_measurement" in changed:
+        pid.proportional_on_measurement = params.proportional_on_measurement
 
 
 class PIDOutputSensor(
@@ -291,10 +323,14 @@ class PIDOutputSensor(
 
         self._attr_native_unit_of_measurement = "%"
         self._attr_state_class = SensorStateClass.MEASUREMENT
-        self.handle = entry.runtime_data.handle
+        self.handle = self._handle
+        self._decimator = StateDecimator(self.handle.publish_policy)
 
     async def async_added_to_hass(self):
         await super().async_added_to_hass()
+        if self.handle.last_known_output is not None:
+            # Already restored together with the PID state
+            return
         if (state := await self.async_get_last_state()) is not None:
             try:
                 value = float(state.state)
@@ -302,6 +338,14 @@ class PIDOutputSensor(
             except (ValueError, TypeError):
                 self.handle.last_known_output = 0.0
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the publication policy allows it."""
+        if self._decimator.should_publish(
+            self.native_value, self.available, self.hass.loop.time()
+        ):
+            self.async_write_ha_state()
+
     @property
     def native_value(self) -> float | None:
         if self.coordinator.data is None:
@@ -328,24 +372,73 @@ class PIDContributionSensor(CoordinatorEntity[PIDDataCoordinator], SensorEntity)
         self._attr_entity_registry_enabled_default = False
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._key = key
-        self._handle = entry.runtime_data.handle
+        self._decimator = StateDecimator(self._handle.publish_policy)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when the publication policy allows it."""
+        if self._decimator.should_publish(
+            self.native_value, self.available, self.hass.loop.time()
+        ):
+            self.async_write_ha_state()
 
     @property
     def native_value(self):
-        contributions = self._handle.last_contributions
-        input_value = self._handle.get_input_sensor_value()
-        setpoint = self._handle.get_number("setpoint")
-
-        if input_value is None or setpoint is None:
-            error = 0
-        else:
-            error = input_value - setpoint
+        tick = self._handle.last_tick
+        if tick is None:
+            return None
 
         value = {
-            "pid_p_contrib": contributions[0],
-            "pid_i_contrib": contributions[1],
-            "pid_d_contrib": contributions[2],
-            "error": error,
-            "pid_i_delta": contributions[3],
+            "pid_p_contrib": tick.p,
+            "pid_i_contrib": tick.i,
+            "pid_d_contrib": tick.d,
+            "error": tick.error,
+            "pid_i_delta": tick.i_delta,
+            "filtered_input": tick.input,
         }.get(self._key)
         return round(value, 2) if value is not None else None
+
+
+class PIDStatsSensor(CoordinatorEntity[PIDDataCoordinator], SensorEntity):
+    """Sensor exposing the tick statistics of the controller."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        key: str,
+        name: str,
+        coordinator: PIDDataCoordinator,
+    ):
+        super().__init__(coordinator)
+
+        BasePIDEntity.__init__(self, hass, entry, key, name)
+
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+        if key in ("tick_latency_p95", "tick_jitter"):
+            self._attr_native_unit_of_measurement = "ms"
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+        else:
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._key = key
+
+    @property
+    def available(self) -> bool:
+        """Stay available while updates fail, failures are what we count."""
+        return True
+
+    @property
+    def native_value(self) -> float | int | None:
+        stats = self.coordinator.stats
+        if self._key == "tick_latency_p95":
+            value = stats.latency_percentile(95)
+        elif self._key == "tick_jitter":
+            value = stats.mean_jitter
+        else:
+            return {
+                "ticks_failed": stats.failed,
+                "ticks_skipped": stats.skipped,
+                "writes_suppressed": self._handle.output_stage.writes_suppressed,
+            }.get(self._key)
+        return round(value * 1000, 3) if value is not None else None
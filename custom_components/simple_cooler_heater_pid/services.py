@@ -0,0 +1,153 @@
+"""Actions (services) of the Simple PID Controller integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    DOMAIN,
+    SERVICE_EXPORT_HISTORY,
+    SERVICE_SET_PARAMETERS,
+    START_MODE_OPTIONS,
+)
+from .parameters import PARAMETER_KEYS
+
+EXPORT_HISTORY_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+# Parameters held by number entities, checked against their min and max
+NUMBER_PARAMETERS = (
+    "kp",
+    "ki",
+    "kd",
+    "setpoint",
+    "starting_output",
+    "sample_time",
+    "output_min",
+    "output_max",
+)
+SWITCH_PARAMETERS = (
+    "auto_mode",
+    "proportional_on_measurement",
+    "windup_protection",
+    "cooling_mode",
+)
+
+SET_PARAMETERS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+            **{vol.Optional(key): vol.Coerce(float) for key in NUMBER_PARAMETERS},
+            **{vol.Optional(key): cv.boolean for key in SWITCH_PARAMETERS},
+            vol.Optional("start_mode"): vol.In(START_MODE_OPTIONS),
+        }
+    ),
+    cv.has_at_least_one_key(*PARAMETER_KEYS),
+)
+
+
+def _get_loaded_entry(hass: HomeAssistant, entry_id: str) -> ConfigEntry:
+    """Return the loaded config entry of a controller or raise."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    return entry
+
+
+def _validate_parameters(entry: ConfigEntry, values: dict[str, Any]) -> None:
+    """Raise if a value is outside the range of its number entity."""
+    handle = entry.runtime_data.handle
+    for key in NUMBER_PARAMETERS:
+        if key not in values:
+            continue
+        entity_id = handle.get_entity_id("number", key)
+        state = handle.hass.states.get(entity_id) if entity_id else None
+        if state is None:
+            continue
+        minimum = state.attributes.get("min")
+        maximum = state.attributes.get("max")
+        if (minimum is not None and values[key] < minimum) or (
+            maximum is not None and values[key] > maximum
+        ):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="value_out_of_range",
+                translation_placeholders={
+                    "parameter": key,
+                    "value": str(values[key]),
+                    "min": str(minimum),
+                    "max": str(maximum),
+                    "entity_id": entity_id,
+                },
+            )
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the actions of the integration."""
+
+    async def _async_export_history(call: ServiceCall) -> ServiceResponse:
+        """Return the tick history of a controller as columns."""
+        entry = _get_loaded_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        # Ticks are stamped with loop time, export them as UNIX timestamps
+        offset = time.time() - hass.loop.time()
+        return entry.runtime_data.handle.history.as_columns(offset)
+
+    async def _async_set_parameters(call: ServiceCall) -> None:
+        """Apply a set of parameters to one or more controllers at once."""
+        values = {key: call.data[key] for key in PARAMETER_KEYS if key in call.data}
+        entries = [
+            _get_loaded_entry(hass, entry_id)
+            for entry_id in dict.fromkeys(call.data[ATTR_CONFIG_ENTRY_ID])
+        ]
+        # Check everything before changing anything
+        for entry in entries:
+            _validate_parameters(entry, values)
+        for entry in entries:
+            entry.runtime_data.handle.async_set_parameters(values)
+        # One evaluation per controller with the complete parameter set
+        await asyncio.gather(
+            *(
+                entry.runtime_data.coordinator.async_request_refresh()
+                for entry in entries
+                if entry.runtime_data.coordinator is not None
+            )
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_PARAMETERS,
+        _async_set_parameters,
+        schema=SET_PARAMETERS_SCHEMA,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        _async_export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
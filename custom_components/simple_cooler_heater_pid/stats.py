@@ -0,0 +1,143 @@
+"""Lightweight tick instrumentation for Simple PID Controller."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds of the latency histogram buckets, in seconds. The last bucket
+# collects everything slower than the last bound.
+LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+)
+
+
+class TickStats:
+    """Per-controller counters, latency histogram and tick jitter.
+
+    Recording a tick is a couple of additions and one bisect, so this can
+    stay enabled in production.
+    """
+
+    __slots__ = (
+        "ticks",
+        "failed",
+        "skipped",
+        "overruns",
+        "late",
+        "missed",
+        "histogram",
+        "last_latency",
+        "max_latency",
+        "expected_interval",
+        "last_start",
+        "last_jitter",
+        "max_jitter",
+        "_jitter_sum",
+        "_jitter_count",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.ticks = 0
+        self.failed = 0
+        self.skipped = 0
+        # Deadlines that passed before the previous tick could run
+        self.overruns = 0
+        # Ticks that ran late, and the sample periods lost while they were late
+        self.late = 0
+        self.missed = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.last_latency: float | None = None
+        self.max_latency = 0.0
+        # Interval the ticks are supposed to arrive at, None if event driven
+        self.expected_interval: float | None = None
+        self.last_start: float | None = None
+        self.last_jitter: float | None = None
+        self.max_jitter = 0.0
+        self._jitter_sum = 0.0
+        self._jitter_count = 0
+
+    def record(
+        self, start: float, latency: float, failed: bool, timed: bool = True
+    ) -> None:
+        """Record one tick that started at loop time start.
+
+        Only timed ticks, the ones a timer delivered, count towards jitter.
+        """
+        self.ticks += 1
+        if failed:
+            self.failed += 1
+        self.histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.last_latency = latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+
+        if not timed:
+            return
+        if self.last_start is not None and self.expected_interval:
+            jitter = abs(start - self.last_start - self.expected_interval)
+            self.last_jitter = jitter
+            self._jitter_sum += jitter
+            self._jitter_count += 1
+            if jitter > self.max_jitter:
+                self.max_jitter = jitter
+        self.last_start = start
+
+    @property
+    def mean_jitter(self) -> float | None:
+        """Return the mean absolute deviation from the expected interval."""
+        if not self._jitter_count:
+            return None
+        return self._jitter_sum / self._jitter_count
+
+    def latency_percentile(self, pct: float) -> float | None:
+        """Return the bucket upper bound below which pct % of ticks finished."""
+        recorded = sum(self.histogram)
+        if not recorded:
+            return None
+        threshold = recorded * pct / 100
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if seen >= threshold:
+                if index < len(LATENCY_BUCKETS):
+                    return LATENCY_BUCKETS[index]
+                return self.max_latency
+        return self.max_latency  # pragma: no cover
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "ticks": self.ticks,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "overruns": self.overruns,
+            "late": self.late,
+            "missed": self.missed,
+            "latency_histogram": {
+                **{
+                    f"<={bound * 1000:g}ms": count
+                    for bound, count in zip(LATENCY_BUCKETS, self.histogram)
+                },
+                f">{LATENCY_BUCKETS[-1] * 1000:g}ms": self.histogram[-1],
+            },
+            "latency_p50": self.latency_percentile(50),
+            "latency_p95": self.latency_percentile(95),
+            "last_latency": self.last_latency,
+            "max_latency": self.max_latency,
+            "expected_interval": self.expected_interval,
+            "last_jitter": self.last_jitter,
+            "mean_jitter": self.mean_jitter,
+            "max_jitter": self.max_jitter,
+        }
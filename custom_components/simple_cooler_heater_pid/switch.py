@@ -3,7 +3,7 @@
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import EntityCategory
 
@@ -45,21 +45,28 @@ class PIDOptionSwitch(SwitchEntity, RestoreEntity):
 
         self._attr_entity_category = EntityCategory.CONFIG
         self._state = desc["default_state"]
+        BasePIDEntity._publish_parameter(self, self._state)
 
     async def async_added_to_hass(self) -> None:
         """Restore previous state if available."""
         await super().async_added_to_hass()
         if (last_state := await self.async_get_last_state()) is not None:
             self._state = last_state.state == "on"
+        BasePIDEntity._publish_parameter(self, self._state)
+        self.async_on_remove(BasePIDEntity._async_listen_parameters_set(self))
 
     @property
     def is_on(self) -> bool:
         return self._state
 
     async def async_turn_on(self, **kwargs) -> None:
-        self._state = True
-        self.async_write_ha_state()
+        self._async_set_parameter(True)
 
     async def async_turn_off(self, **kwargs) -> None:
-        self._state = False
+        self._async_set_parameter(False)
+
+    @callback
+    def _async_set_parameter(self, value: bool) -> None:
+        self._state = value
+        BasePIDEntity._publish_parameter(self, value)
         self.async_write_ha_state()
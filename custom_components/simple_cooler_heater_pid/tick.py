@@ -0,0 +1,86 @@
+"""Tick records published by the PID loop."""
+
+from __future__ import annotations
+
+from array import array
+from math import isnan, nan
+from typing import Any, NamedTuple
+
+
+class PIDTick(NamedTuple):
+    """Immutable snapshot of one PID evaluation.
+
+    Everything in here is what the controller actually used and produced in
+    that tick, so all entities reading it agree with each other. error is
+    input - setpoint, as shown by the Error sensor. input is the value after
+    the input filters, raw_input the reading of the sensor.
+    """
+
+    timestamp: float
+    input: float
+    setpoint: float | None
+    error: float | None
+    p: float
+    i: float
+    d: float
+    i_delta: float
+    output: float
+    raw_input: float | None = None
+
+
+class TickHistory:
+    """Fixed-capacity ring buffer of recent ticks, stored column by column.
+
+    Every column is a preallocated array of doubles, so keeping the history
+    costs the same memory however long the controller runs. Missing values
+    (no setpoint) are stored as NaN.
+    """
+
+    COLUMNS = ("timestamp", "input", "setpoint", "p", "i", "d", "output")
+
+    __slots__ = ("capacity", "_columns", "_next", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty history for capacity ticks."""
+        self.capacity = capacity
+        self._columns = [array("d", bytes(8 * capacity)) for _ in self.COLUMNS]
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of ticks stored."""
+        return self._count
+
+    def append(self, tick: PIDTick) -> None:
+        """Store a tick, overwriting the oldest one when full."""
+        if not self.capacity:
+            return
+        index = self._next
+        timestamp, input_, setpoint, p, i, d, output = self._columns
+        timestamp[index] = tick.timestamp
+        input_[index] = tick.input
+        setpoint[index] = nan if tick.setpoint is None else tick.setpoint
+        p[index] = tick.p
+        i[index] = tick.i
+        d[index] = tick.d
+        output[index] = tick.output
+        self._next = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def as_columns(self, time_offset: float = 0.0) -> dict[str, Any]:
+        """Return the ticks oldest first as one list per column.
+
+        time_offset is added to the timestamps, e.g. to turn loop time into
+        a UNIX timestamp.
+        """
+        start = (self._next - self._count) % self.capacity if self.capacity else 0
+        columns: dict[str, Any] = {"count": self._count}
+        for name, column in zip(self.COLUMNS, self._columns):
+            values = column[start:] + column[:start] if start else column[:]
+            values = values[: self._count]
+            if name == "timestamp":
+                columns[name] = [value + time_offset for value in values]
+            else:
+                columns[name] = [None if isnan(value) else value for value in values]
+        return columns
@@ -0,0 +1,13 @@
+"""Offline plant simulation and benchmark harness for the PID loop."""
+
+from .harness import SimClock, SimulationResult, run_closed_loop, step_metrics
+from .plants import FirstOrderDeadTimePlant, SecondOrderThermalPlant
+
+__all__ = [
+    "FirstOrderDeadTimePlant",
+    "SecondOrderThermalPlant",
+    "SimClock",
+    "SimulationResult",
+    "run_closed_loop",
+    "step_metrics",
+]
@@ -0,0 +1,142 @@
+"""Faster-than-real-time closed-loop harness around the real update_pid."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import statistics
+import time
+
+
+class SimClock:
+    """Injectable clock advanced by the harness instead of wall time."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@dataclass
+class SimulationResult:
+    """Compute cost and control quality of one simulation run."""
+
+    ticks: int
+    wall_time: float
+    ticks_per_second: float
+    sim_seconds_per_wall_second: float
+    latency_p50_us: float
+    latency_p95_us: float
+    latency_p99_us: float
+    settling_time: float | None
+    overshoot_pct: float
+    final_value: float
+    values: list[float]
+
+
+def step_metrics(
+    values: list[float],
+    start: float,
+    setpoint: float,
+    dt: float,
+    band_pct: float = 2.0,
+) -> tuple[float | None, float]:
+    """Return (settling time, overshoot %) of a step response.
+
+    The settling time is the time after which the value stays within
+    band_pct of the step size around the setpoint; None if it never does.
+    """
+    step = setpoint - start
+    band = abs(step) * band_pct / 100
+    settling_time = None
+    for index in range(len(values) - 1, -1, -1):
+        if abs(values[index] - setpoint) > band:
+            if index < len(values) - 1:
+                settling_time = (index + 1) * dt
+            break
+    else:
+        settling_time = 0.0
+    peak = max(values) if step >= 0 else min(values)
+    overshoot = max(0.0, (peak - setpoint) / step * 100) if step else 0.0
+    return settling_time, overshoot
+
+
+async def run_closed_loop(
+    hass,
+    entry,
+    plant,
+    setpoint: float,
+    duration: float,
+    sample_time: float = 1.0,
+    **params,
+) -> SimulationResult:
+    """Drive the entry's real update_pid against plant for duration seconds.
+
+    Every tick writes the plant value into the input sensor, runs the
+    coordinator's update method and feeds the returned output back into the
+    plant. Simulated time comes from a SimClock injected into the PID, so
+    the run is as fast as the code allows.
+    """
+    handle = entry.runtime_data.handle
+    coordinator = entry.runtime_data.coordinator
+    clock = SimClock()
+    handle.pid.time_fn = clock
+
+    values = dict(
+        kp=1.0,
+        ki=0.1,
+        kd=0.0,
+        setpoint=setpoint,
+        starting_output=0.0,
+        sample_time=sample_time,
+        output_min=0.0,
+        output_max=100.0,
+        auto_mode=True,
+        proportional_on_measurement=False,
+        windup_protection=True,
+        cooling_mode=False,
+        start_mode="Zero start",
+    )
+    values.update(params)
+    for key, value in values.items():
+        setattr(handle.params, key, value)
+
+    sensor = handle.sensor_entity_id
+    start_value = plant.value
+    ticks = int(duration / sample_time)
+    latencies: list[float] = []
+    trajectory: list[float] = []
+    output = 0.0
+
+    wall_start = time.perf_counter()
+    for _ in range(ticks):
+        value = plant.step(output)
+        trajectory.append(value)
+        hass.states.async_set(sensor, str(value))
+        clock.advance(sample_time)
+
+        tick_start = time.perf_counter()
+        output = await coordinator.update_method()
+        latencies.append(time.perf_counter() - tick_start)
+    wall_time = time.perf_counter() - wall_start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    settling_time, overshoot = step_metrics(
+        trajectory, start_value, setpoint, sample_time
+    )
+    return SimulationResult(
+        ticks=ticks,
+        wall_time=wall_time,
+        ticks_per_second=ticks / wall_time,
+        sim_seconds_per_wall_second=duration / wall_time,
+        latency_p50_us=quantiles[49] * 1e6,
+        latency_p95_us=quantiles[94] * 1e6,
+        latency_p99_us=quantiles[98] * 1e6,
+        settling_time=settling_time,
+        overshoot_pct=overshoot,
+        final_value=trajectory[-1],
+        values=trajectory,
+    )
@@ -0,0 +1,82 @@
+"""Plant models for offline closed-loop simulation."""
+
+from __future__ import annotations
+
+from collections import deque
+import math
+
+
+class FirstOrderDeadTimePlant:
+    """First-order-plus-dead-time (FOPDT) process.
+
+    The output approaches ``ambient + gain * u(t - dead_time)`` with time
+    constant ``tau``. The step is discretized exactly for a constant input
+    over each step.
+    """
+
+    def __init__(
+        self,
+        gain: float,
+        tau: float,
+        dead_time: float,
+        ambient: float = 0.0,
+        dt: float = 1.0,
+    ) -> None:
+        self.gain = gain
+        self.tau = tau
+        self.ambient = ambient
+        self.value = ambient
+        self._decay = math.exp(-dt / tau)
+        self._dt = dt
+        self._delay = deque([0.0] * max(int(round(dead_time / dt)), 0))
+
+    def step(self, u: float) -> float:
+        """Apply input u for one step and return the new process value."""
+        if self._delay:
+            self._delay.append(u)
+            u = self._delay.popleft()
+        target = self.ambient + self.gain * u
+        self.value = target + (self.value - target) * self._decay
+        return self.value
+
+
+class SecondOrderThermalPlant:
+    """Two-mass thermal model: a heater body warming a room.
+
+    ``u`` is the heater power in percent of ``power``. The heater body
+    (capacity ``c_heater``) exchanges heat with the room (``c_room``) through
+    ``r_heater_room``; the room loses heat to ambient through
+    ``r_room_ambient``. The room temperature is the measured value.
+    """
+
+    def __init__(
+        self,
+        power: float,
+        c_heater: float,
+        c_room: float,
+        r_heater_room: float,
+        r_room_ambient: float,
+        ambient: float = 20.0,
+        dt: float = 1.0,
+        substeps: int = 10,
+    ) -> None:
+        self.power = power
+        self.c_heater = c_heater
+        self.c_room = c_room
+        self.r_heater_room = r_heater_room
+        self.r_room_ambient = r_room_ambient
+        self.ambient = ambient
+        self.heater = ambient
+        self.value = ambient
+        self._h = dt / substeps
+        self._substeps = substeps
+
+    def step(self, u: float) -> float:
+        """Apply input u for one step and return the room temperature."""
+        heat_in = self.power * max(0.0, min(u, 100.0)) / 100
+        for _ in range(self._substeps):
+            to_room = (self.heater - self.value) / self.r_heater_room
+            to_ambient = (self.value - self.ambient) / self.r_room_ambient
+            self.heater += self._h * (heat_in - to_room) / self.c_heater
+            self.value += self._h * (to_room - to_ambient) / self.c_room
+        return self.value
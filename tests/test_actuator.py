@@ -0,0 +1,264 @@
+import asyncio
+
+from homeassistant.core import State
+
+from custom_components.simple_cooler_heater_pid import actuator
+from custom_components.simple_cooler_heater_pid.actuator import (
+    ACTUATOR_DRIVERS,
+    ActuatorDriver,
+    ActuatorProfile,
+    ActuatorWriteQueue,
+    OutputStage,
+    register_actuator_driver,
+)
+
+
+def test_output_stage_skips_unchanged_value():
+    """Writing the same value twice only issues one write."""
+    stage = OutputStage()
+    assert stage.should_write("number.out", 10.0, now=0.0) is True
+    assert stage.should_write("number.out", 10.0, now=1.0) is False
+    assert stage.should_write("number.out", 11.0, now=2.0) is True
+    assert (stage.writes_issued, stage.writes_suppressed) == (2, 1)
+
+
+def test_output_stage_absolute_deadband():
+    """Values within the absolute deadband are suppressed."""
+    stage = OutputStage(deadband=0.5)
+    assert stage.should_write("number.out", 10.0, now=0.0) is True
+    assert stage.should_write("number.out", 10.4, now=1.0) is False
+    assert stage.should_write("number.out", 9.6, now=2.0) is False
+    assert stage.should_write("number.out", 10.6, now=3.0) is True
+
+
+def test_output_stage_relative_deadband():
+    """The relative deadband scales with the last written value."""
+    stage = OutputStage(deadband_relative=10)
+    assert stage.should_write("number.out", 50.0, now=0.0) is True
+    assert stage.should_write("number.out", 54.0, now=1.0) is False
+    assert stage.should_write("number.out", 56.0, now=2.0) is True
+
+
+def test_output_stage_refresh_interval_forces_write():
+    """An unchanged value is written again once the refresh interval passed."""
+    stage = OutputStage(refresh_interval=60)
+    assert stage.should_write("number.out", 10.0, now=0.0) is True
+    assert stage.should_write("number.out", 10.0, now=59.0) is False
+    assert stage.should_write("number.out", 10.0, now=60.0) is True
+    assert stage.should_write("number.out", 10.0, now=61.0) is False
+
+
+def test_output_stage_tracks_entities_separately():
+    """Each output entity has its own last written value."""
+    stage = OutputStage()
+    assert stage.should_write("number.a", 1.0, now=0.0) is True
+    assert stage.should_write("number.b", 1.0, now=0.0) is True
+    assert stage.as_dict()["last_written"] == {"number.a": 1.0, "number.b": 1.0}
+
+
+def test_actuator_profile_number_with_integer_step():
+    """A number with step >= 1 gets integer output clamped to its range."""
+    state = State("number.valve", "10", {"min": 0, "max": 50, "step": 1})
+    profile = ActuatorProfile("number.valve", state)
+    assert (profile.domain, profile.service, profile.value_field) == (
+        "number",
+        "set_value",
+        "value",
+    )
+    assert profile.integer is True
+    assert profile.convert(12.6) == 13
+    assert profile.convert(80.0) == 50
+    assert profile.convert(-3.0) == 0
+
+
+def test_actuator_profile_fan_and_light_clamp_to_percentage():
+    """Fan and light outputs are clamped to 0..100."""
+    fan = ActuatorProfile("fan.vent", State("fan.vent", "on", {"percentage_step": 1}))
+    assert (fan.service, fan.value_field) == ("set_percentage", "percentage")
+    assert fan.convert(120.4) == 100
+    light = ActuatorProfile("light.lamp", State("light.lamp", "on"))
+    assert (light.service, light.value_field) == ("turn_on", "brightness_pct")
+    assert light.convert(-5.0) == 0
+    assert light.integer is False
+
+
+def test_actuator_profile_unsupported_domain_and_missing_state(caplog):
+    """Unsupported domains and missing states are reported once at build time."""
+    profile = ActuatorProfile("switch.heater", None)
+    assert profile.service is None
+    assert "domain switch not supported" in caplog.text
+    assert "State for entity switch.heater not found" in caplog.text
+
+
+def test_actuator_profile_climate_and_water_heater_use_target_temperature():
+    """Temperature setpoints follow the entity's range and step."""
+    climate = ActuatorProfile(
+        "climate.room",
+        State(
+            "climate.room",
+            "heat",
+            {"min_temp": 7, "max_temp": 30, "target_temp_step": 0.5},
+        ),
+    )
+    assert (climate.service, climate.value_field) == ("set_temperature", "temperature")
+    assert climate.convert(21.3) == 21.5
+    assert climate.convert(35.0) == 30
+    assert climate.service_data(21.5) == {
+        "entity_id": "climate.room",
+        "temperature": 21.5,
+    }
+    boiler = ActuatorProfile(
+        "water_heater.boiler",
+        State("water_heater.boiler", "eco", {"min_temp": 40, "max_temp": 60}),
+    )
+    assert boiler.service == "set_temperature"
+    assert boiler.convert(20.0) == 40
+
+
+def test_actuator_profile_valve_and_cover_use_position():
+    """Valve and cover outputs are positions in 0..100."""
+    valve = ActuatorProfile("valve.radiator", State("valve.radiator", "open"))
+    assert (valve.service, valve.value_field) == ("set_valve_position", "position")
+    assert valve.convert(104.0) == 100
+    cover = ActuatorProfile("cover.vent", State("cover.vent", "open"))
+    assert cover.service == "set_cover_position"
+    assert cover.service_data(40.0) == {"entity_id": "cover.vent", "position": 40.0}
+
+
+def test_registered_driver_is_used(monkeypatch):
+    """Drivers registered for a new domain are picked up with their scale."""
+    monkeypatch.setattr(actuator, "ACTUATOR_DRIVERS", dict(ACTUATOR_DRIVERS))
+    register_actuator_driver(
+        "siren", ActuatorDriver("turn_on", "volume_level", 0, 1, scale=0.01)
+    )
+    profile = ActuatorProfile("siren.alarm", State("siren.alarm", "off"))
+    assert profile.service_data(profile.convert(50.0)) == {
+        "entity_id": "siren.alarm",
+        "volume_level": 0.5,
+    }
+
+
+async def test_actuator_profile_rebuilt_on_attribute_change(hass, config_entry):
+    """The cached profile is dropped when the output entity's attributes change."""
+    handle = config_entry.runtime_data.handle
+    handle.output_entity_id = "number.valve"
+    hass.states.async_set("number.valve", "1", {"min": 0, "max": 10, "step": 0.5})
+    unsub = handle.async_track_output_entity()
+
+    profile = handle.get_actuator_profile()
+    assert profile.integer is False
+    assert handle.get_actuator_profile() is profile
+
+    # a plain state change keeps the profile
+    hass.states.async_set("number.valve", "2", {"min": 0, "max": 10, "step": 0.5})
+    await hass.async_block_till_done()
+    assert handle.get_actuator_profile() is profile
+
+    hass.states.async_set("number.valve", "2", {"min": 0, "max": 10, "step": 1})
+    await hass.async_block_till_done()
+    assert handle.get_actuator_profile() is not profile
+    assert handle.get_actuator_profile().integer is True
+    unsub()
+
+
+async def test_actuator_profile_kept_on_value_attribute_change(hass, config_entry):
+    """Attributes the profile is not built from do not drop it."""
+    handle = config_entry.runtime_data.handle
+    handle.output_entity_id = "climate.room"
+    attrs = {"min_temp": 7, "max_temp": 30, "target_temp_step": 0.5}
+    hass.states.async_set(
+        "climate.room", "heat", {**attrs, "current_temperature": 20, "temperature": 21}
+    )
+    unsub = handle.async_track_output_entity()
+    profile = handle.get_actuator_profile()
+
+    hass.states.async_set(
+        "climate.room",
+        "heat",
+        {**attrs, "current_temperature": 20.5, "temperature": 22},
+    )
+    await hass.async_block_till_done()
+    assert handle.get_actuator_profile() is profile
+
+    hass.states.async_set(
+        "climate.room", "heat", {**attrs, "max_temp": 25, "current_temperature": 20.5}
+    )
+    await hass.async_block_till_done()
+    assert handle.get_actuator_profile() is not profile
+    assert handle.get_actuator_profile().max_value == 25
+    unsub()
+
+
+async def test_write_queue_keeps_one_write_in_flight(hass):
+    """Writes behind a slow one collapse into the latest value."""
+    release = asyncio.Event()
+    written = []
+
+    async def slow_set_value(call):
+        written.append(call.data["value"])
+        await release.wait()
+
+    hass.services.async_register("number", "set_value", slow_set_value)
+    queue = ActuatorWriteQueue(hass, "number.valve")
+
+    for value in (1.0, 2.0, 3.0, 4.0):
+        queue.async_write(
+            "number", "set_value", {"entity_id": "number.valve", "value": value}
+        )
+        await asyncio.sleep(0)
+    assert written == [1.0]
+    assert queue.depth == 2
+
+    release.set()
+    await hass.async_block_till_done()
+
+    # 2.0 and 3.0 were replaced while 1.0 was in flight
+    assert written == [1.0, 4.0]
+    assert queue.depth == 0
+    stats = queue.as_dict()
+    assert stats["max_depth"] == 2
+    assert stats["writes_completed"] == 2
+    assert stats["writes_replaced"] == 2
+    assert stats["max_latency"] > 0
+
+
+async def test_write_queue_counts_failed_writes(hass):
+    """A failing service call is counted and does not block later writes."""
+    queue = ActuatorWriteQueue(hass, "valve.missing")
+    # No such service registered
+    queue.async_write("valve", "set_valve_position", {"entity_id": "valve.missing"})
+    await hass.async_block_till_done()
+
+    assert queue.as_dict()["writes_failed"] == 1
+    assert queue.depth == 0
+
+
+async def test_writes_cancelled_on_unload(hass, config_entry):
+    """A write still in flight does not outlive its config entry."""
+    written = []
+    cancelled = asyncio.Event()
+
+    async def hanging_set_value(call):
+        written.append(call.data["value"])
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    hass.services.async_register("number", "set_value", hanging_set_value)
+    queue = config_entry.runtime_data.handle.output_stage.queue(hass, "number.valve")
+    for value in (1.0, 2.0):
+        queue.async_write(
+            "number", "set_value", {"entity_id": "number.valve", "value": value}
+        )
+        await asyncio.sleep(0)
+    assert queue.depth == 2
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert cancelled.is_set()
+    assert queue.depth == 0
+    # The pending write was dropped
+    assert written == [1.0]
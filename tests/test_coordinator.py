@@ -1,4 +1,7 @@
 import pytest
+from datetime import timedelta
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 from custom_components.simple_cooler_heater_pid.coordinator import PIDDataCoordinator
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
@@ -24,3 +27,87 @@ async def test_async_update_data_failure(hass):
     with pytest.raises(UpdateFailed) as excinfo:
         await coordinator._async_update_data()
     assert "PID update failed: test error" in str(excinfo.value)
+
+
+async def test_track_input_runs_on_new_value(hass):
+    """In input-change mode a new sensor value triggers an update right away."""
+    calls = []
+
+    async def fake_update():
+        calls.append(True)
+        return 1.0
+
+    hass.states.async_set("sensor.fast", "1.0")
+    coordinator = PIDDataCoordinator(hass, "test", fake_update, interval=10)
+    unsub = coordinator.async_track_input("sensor.fast", 0, 60)
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    hass.states.async_set("sensor.fast", "2.0")
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    # attribute-only changes and unavailable readings do not trigger a run
+    hass.states.async_set("sensor.fast", "2.0", {"foo": "bar"})
+    hass.states.async_set("sensor.fast", "unavailable")
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    unsub()
+    await coordinator.async_shutdown()
+
+
+async def test_track_input_respects_min_interval(hass):
+    """Changes inside the minimum interval collapse into one delayed run."""
+    calls = []
+
+    async def fake_update():
+        calls.append(True)
+        return 1.0
+
+    hass.states.async_set("sensor.fast", "1.0")
+    coordinator = PIDDataCoordinator(hass, "test", fake_update, interval=10)
+    unsub = coordinator.async_track_input("sensor.fast", 5, 60)
+
+    hass.states.async_set("sensor.fast", "2.0")
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.fast", "3.0")
+    hass.states.async_set("sensor.fast", "4.0")
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    unsub()
+    await coordinator.async_shutdown()
+
+
+async def test_refresh_requests_coalesce_within_window(hass):
+    """A burst of refresh requests leads to one run at the end of the window."""
+    calls = []
+
+    async def fake_update():
+        calls.append(True)
+        return 1.0
+
+    coordinator = PIDDataCoordinator(
+        hass, "test", fake_update, interval=None, coalesce_window=2
+    )
+    for _ in range(5):
+        await coordinator.async_request_refresh()
+    await hass.async_block_till_done()
+    assert calls == []
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=3))
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    # Without a window every request runs right away
+    coordinator.coalesce_window = 0
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=6))
+    await coordinator.async_request_refresh()
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    await coordinator.async_shutdown()
@@ -1,72 +1,8 @@
-import pytest
 from homeassistant.helpers import entity_registry as er
 from custom_components.simple_cooler_heater_pid import PIDDeviceHandle
 from custom_components.simple_cooler_heater_pid.const import DOMAIN
 
 
-class DummyRegistry:
-    def __init__(self, entity_id):
-        self._entity_id = entity_id
-
-    def async_get_entity_id(self, platform, domain, unique_id):
-        # Return entity_id or None
-        if self._entity_id and domain == DOMAIN:
-            return self._entity_id
-        return None
-
-
-@pytest.mark.parametrize(
-    "state_value, expected",
-    [
-        ("12.34", 12.34),  # valid number
-        ("abc", None),  # no number → exception
-        ("unknown", None),  # unknown → skip
-        ("unavailable", None),  # unavailable → skip
-    ],
-)
-def test_get_number_various_states(
-    monkeypatch, hass, config_entry, state_value, expected
-):
-    """Cover lines 45–54 of get_number."""
-    # 1) Stel een fake entity in de state machine
-    fake_eid = "number.pid_entry_test"
-    hass.states.async_set(fake_eid, state_value)
-
-    # 2) Mock de registry so _get_entity_id gives fake_eid
-    monkeypatch.setattr(er, "async_get", lambda hass_: DummyRegistry(fake_eid))
-
-    # 3) Create handle and call get_number
-    handle = PIDDeviceHandle(hass, config_entry)
-    result = handle.get_number("test")
-
-    assert result == expected
-
-
-def test_get_number_no_entity(monkeypatch, hass, config_entry):
-    """If _get_entity_id is None, get_number should be None."""
-    # Mock registry zonder entity
-    monkeypatch.setattr(er, "async_get", lambda hass_: DummyRegistry(None))
-
-    handle = PIDDeviceHandle(hass, config_entry)
-    assert handle.get_number("anything") is None
-
-
-def test_get_switch_on_off(monkeypatch, hass, config_entry):
-    """Cover on/off in get_switch."""
-    fake_entity = "switch.pid_entry_test"
-    # Force _get_entity_id terug te geven
-    handle = PIDDeviceHandle(hass, config_entry)
-    monkeypatch.setattr(handle, "_get_entity_id", lambda platform, key: fake_entity)
-
-    # Eerst “on” → True
-    hass.states.async_set(fake_entity, "on")
-    assert handle.get_switch("any_key") is True
-
-    # Dan “off” → False
-    hass.states.async_set(fake_entity, "off")
-    assert handle.get_switch("any_key") is False
-
-
 def test_get_input_sensor_value_invalid(hass, config_entry):
     """Cover the ValueError branch in get_input_sensor_value (lines 73–77)."""
     handle = PIDDeviceHandle(hass, config_entry)
@@ -80,68 +16,107 @@ def test_get_input_sensor_value_invalid(hass, config_entry):
     assert handle.get_input_sensor_value() is None
 
 
-@pytest.mark.parametrize("state", ["unknown", "unavailable"])
-async def test_get_switch_returns_true_when_state_unavailable(
-    hass, config_entry, state
-):
-    """Regel 79: get_switch returns True if state 'unknown' or 'unavailable'."""
-    fake_entity = f"switch.{config_entry.entry_id}_test_key"
-    handle = PIDDeviceHandle(hass, config_entry)
-    # Force existence of entity_id
-    handle._get_entity_id = lambda platform, key: fake_entity
-    # State to 'unknown' or 'unavailable'
-    hass.states.async_set(fake_entity, state)
-    assert handle.get_switch("test_key") is True
-
-
-async def test_get_switch_returns_true_when_no_entity_configured(hass, config_entry):
-    """Regel 74: get_switch must return True if _get_entity_id None."""
-    handle = PIDDeviceHandle(hass, config_entry)
-    # Force no  entity_id
-    handle._get_entity_id = lambda platform, key: None
-    assert handle.get_switch("any_key") is True
-
-
-@pytest.mark.parametrize(
-    "state_value, expected",
-    [
-        ("Zero start", "Zero start"),  # valid select option
-        ("unknown", None),  # invalid
-        ("unavailable", None),  # invalid
-        (None, None),  # no state
-    ],
-)
-def test_get_select_various_states(
-    monkeypatch, hass, config_entry, state_value, expected
-):
-    """Test PIDDeviceHandle.get_select behavior for valid and invalid entity states."""
-
-    fake_eid = "select.pid_entry_start_mode"
-
-    # Inject fake state
-    if state_value is not None:
-        hass.states.async_set(fake_eid, state_value)
-
-    # Patch entity_registry.async_get(hass) → returns dummy registry object
-    class DummyRegistry:
-        def async_get_entity_id(self, platform, domain, unique_id):
-            if domain == DOMAIN and unique_id.endswith("start_mode"):
-                return fake_eid
-            return None
-
-    monkeypatch.setattr(er, "async_get", lambda hass: DummyRegistry())
-
-    handle = PIDDeviceHandle(hass, config_entry)
-    result = handle.get_select("start_mode")
-
-    assert result == expected
-
-
-def test_get_select_no_entity(monkeypatch, hass, config_entry):
-    """If _get_entity_id returns None, get_select should return None."""
-    # Patch de registry zo dat er geen entity_id wordt gevonden
-    monkeypatch.setattr(er, "async_get", lambda hass_: DummyRegistry(None))
-
-    handle = PIDDeviceHandle(hass, config_entry)
-    # Key mag willekeurig zijn, er is immers geen entity
-    assert handle.get_select("nonexistent_key") is None
+# Every parameter entity of an entry
+TICK_LOOKUPS = [
+    ("number", "kp"),
+    ("number", "ki"),
+    ("number", "kd"),
+    ("number", "setpoint"),
+    ("number", "starting_output"),
+    ("number", "sample_time"),
+    ("number", "output_min"),
+    ("number", "output_max"),
+    ("select", "start_mode"),
+    ("switch", "cooling_mode"),
+    ("switch", "auto_mode"),
+    ("switch", "proportional_on_measurement"),
+    ("switch", "windup_protection"),
+]
+
+
+async def test_get_entity_id_is_cached(monkeypatch, hass, config_entry):
+    """The registry is only consulted once per (platform, key)."""
+    handle = config_entry.runtime_data.handle
+    handle._entity_ids.clear()
+    registry = er.async_get(hass)
+    calls = []
+    original = registry.async_get_entity_id
+
+    def counting(platform, domain, unique_id):
+        calls.append(unique_id)
+        return original(platform, domain, unique_id)
+
+    monkeypatch.setattr(registry, "async_get_entity_id", counting)
+
+    first = handle._get_entity_id("number", "kp")
+    assert first is not None
+    for _ in range(5):
+        assert handle._get_entity_id("number", "kp") == first
+    assert len(calls) == 1
+
+
+async def test_get_entity_id_cache_invalidated_on_rename(hass, config_entry):
+    """Renaming one of our entities refreshes the cached entity_id."""
+    handle = config_entry.runtime_data.handle
+    old_id = handle._get_entity_id("number", "kp")
+
+    registry = er.async_get(hass)
+    registry.async_update_entity(old_id, new_entity_id="number.renamed_kp")
+    await hass.async_block_till_done()
+
+    assert handle._get_entity_id("number", "kp") == "number.renamed_kp"
+
+
+async def test_get_entity_id_cache_ignores_foreign_entities(hass, config_entry):
+    """Registry events for other integrations keep the cache intact."""
+    handle = config_entry.runtime_data.handle
+    handle._get_entity_id("number", "kp")
+
+    registry = er.async_get(hass)
+    registry.async_get_or_create("sensor", "other", "unrelated")
+    await hass.async_block_till_done()
+
+    assert ("number", "kp") in handle._entity_ids
+
+
+async def test_tick_lookup_cost(monkeypatch, hass, config_entry):
+    """Only the first tick resolves its entity_ids in the registry."""
+    handle = config_entry.runtime_data.handle
+    handle._entity_ids.clear()
+    registry = er.async_get(hass)
+    calls = []
+    original = registry.async_get_entity_id
+
+    def counting(platform, domain, unique_id):
+        calls.append(unique_id)
+        return original(platform, domain, unique_id)
+
+    monkeypatch.setattr(registry, "async_get_entity_id", counting)
+
+    def tick():
+        for platform, key in TICK_LOOKUPS:
+            handle._get_entity_id(platform, key)
+
+    tick()
+    assert len(calls) == len(TICK_LOOKUPS)
+    for _ in range(100):
+        tick()
+    assert len(calls) == len(TICK_LOOKUPS)
+
+
+async def test_entities_share_the_runtime_handle(hass, config_entry):
+    """Every entity of the entry is bound to the one handle of the entry."""
+    handle = config_entry.runtime_data.handle
+    platforms = [
+        platform
+        for platform in hass.data["entity_platform"][DOMAIN]
+        if platform.config_entry is config_entry
+    ]
+    entities = [
+        entity for platform in platforms for entity in platform.entities.values()
+    ]
+
+    assert entities
+    assert all(entity._handle is handle for entity in entities)
+    # Slotted, so a stray attribute cannot silently shadow the shared state
+    assert not hasattr(handle, "__dict__")
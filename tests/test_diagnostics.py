@@ -9,6 +9,7 @@ from custom_components.simple_cooler_heater_pid.const import (
     DEFAULT_INPUT_RANGE_MAX,
     DEFAULT_OUTPUT_RANGE_MIN,
     DEFAULT_OUTPUT_RANGE_MAX,
+    DEFAULT_PARAMETER_COALESCE_WINDOW,
 )
 
 
@@ -34,3 +35,10 @@ async def test_config_entry_diagnostics(hass, config_entry):
     assert data["input_range_max"] == DEFAULT_INPUT_RANGE_MAX
     assert data["output_range_min"] == DEFAULT_OUTPUT_RANGE_MIN
     assert data["output_range_max"] == DEFAULT_OUTPUT_RANGE_MAX
+    assert data["parameter_coalesce_window"] == DEFAULT_PARAMETER_COALESCE_WINDOW
+    assert data["input_pending"] is False
+    assert result["output"]["writes_issued"] == 0
+    assert result["output"]["writes_suppressed"] == 0
+    assert result["ticks"]["failed"] == 0
+    assert result["publish"]["every_n_ticks"] == 1
+    assert result["history"]["count"] == 0
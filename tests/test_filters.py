@@ -0,0 +1,85 @@
+import pytest
+
+from custom_components.simple_cooler_heater_pid.const import (
+    CONF_FILTER_MEDIAN_WINDOW,
+    CONF_INPUT_FILTERS,
+)
+from custom_components.simple_cooler_heater_pid.filters import (
+    EMAFilter,
+    FilterChain,
+    KalmanFilter,
+    LowPassFilter,
+    MovingMedianFilter,
+)
+
+
+def test_ema_filter():
+    """The first sample passes, later ones move by alpha."""
+    stage = EMAFilter(0.5)
+    assert stage.update(10.0, 0) == 10.0
+    assert stage.update(20.0, 1) == 15.0
+
+
+def test_moving_median_rejects_spikes():
+    """A single spike does not get through a median of three."""
+    stage = MovingMedianFilter(3)
+    outputs = [stage.update(value, n) for n, value in enumerate([1, 1, 100, 1, 2, 3])]
+    assert outputs == [1, 1, 1, 1, 2, 2]
+    assert len(stage._sorted) == 3
+
+
+def test_lowpass_follows_real_time():
+    """A longer gap between samples moves the output further."""
+    stage = LowPassFilter(tau=10.0)
+    stage.update(0.0, 0.0)
+    assert stage.update(10.0, 10.0) == pytest.approx(5.0)
+    assert stage.update(10.0, 10.0) == pytest.approx(5.0)
+
+
+def test_kalman_converges_on_constant_value():
+    """Noise around a constant value averages out."""
+    stage = KalmanFilter(process_noise=0.0001, measurement_noise=1.0)
+    for n in range(200):
+        value = stage.update(20.0 + (1 if n % 2 else -1), n)
+    assert value == pytest.approx(20.0, abs=0.1)
+
+
+def test_filter_chain_order_and_unknown_names():
+    """Stages run in the given order and unknown names are dropped."""
+    chain = FilterChain(["median", "bogus", "ema"], 0.5, 3, 10.0, 0.01, 1.0)
+    assert chain.names == ["median", "ema"]
+    assert chain
+    assert not FilterChain([], 0.5, 3, 10.0, 0.01, 1.0)
+    assert chain.update(4.0, 0) == 4.0
+    # median of (4, 100) is 52, the EMA moves halfway there from 4
+    assert chain.update(100.0, 1) == 28.0
+
+
+async def test_filtered_input_feeds_pid(hass, config_entry):
+    """The PID and the tick record use the filtered value."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={CONF_INPUT_FILTERS: ["median"], CONF_FILTER_MEDIAN_WINDOW: 3},
+    )
+    await hass.async_block_till_done()
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    chain = handle.input_filter
+
+    for value in ("20", "21", "90"):
+        hass.states.async_set("sensor.test_input", value)
+        await coordinator.update_method()
+    assert handle.last_tick.raw_input == 90.0
+    assert handle.last_tick.input == 21.0
+
+    # Unrelated option changes keep the filter state
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_INPUT_FILTERS: ["median"],
+            CONF_FILTER_MEDIAN_WINDOW: 3,
+            "publish_min_interval": 5.0,
+        },
+    )
+    await hass.async_block_till_done()
+    assert handle.input_filter is chain
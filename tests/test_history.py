@@ -0,0 +1,80 @@
+import pytest
+
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.simple_cooler_heater_pid.const import (
+    DOMAIN,
+    SERVICE_EXPORT_HISTORY,
+)
+from custom_components.simple_cooler_heater_pid.tick import PIDTick, TickHistory
+
+
+def _tick(n, setpoint=50.0):
+    return PIDTick(
+        timestamp=float(n),
+        input=float(n),
+        setpoint=setpoint,
+        error=None,
+        p=1.0,
+        i=2.0,
+        d=3.0,
+        i_delta=0.0,
+        output=float(10 * n),
+    )
+
+
+def test_history_wraps_and_exports_oldest_first():
+    """Only the last capacity ticks are kept, in order."""
+    history = TickHistory(3)
+    for n in range(5):
+        history.append(_tick(n, setpoint=None if n == 4 else 50.0))
+
+    assert len(history) == 3
+    columns = history.as_columns(time_offset=100.0)
+    assert columns["count"] == 3
+    assert columns["timestamp"] == [102.0, 103.0, 104.0]
+    assert columns["output"] == [20.0, 30.0, 40.0]
+    assert columns["setpoint"] == [50.0, 50.0, None]
+
+
+def test_history_partial_and_disabled():
+    """A partly filled or zero-sized history exports what it has."""
+    history = TickHistory(10)
+    history.append(_tick(1))
+    assert history.as_columns()["input"] == [1.0]
+
+    disabled = TickHistory(0)
+    disabled.append(_tick(1))
+    assert disabled.as_columns() == {
+        "count": 0,
+        **{name: [] for name in TickHistory.COLUMNS},
+    }
+
+
+async def test_export_history_service(hass, config_entry):
+    """The action returns the recorded ticks of the controller."""
+    coordinator = config_entry.runtime_data.coordinator
+    params = config_entry.runtime_data.handle.params
+    params.sample_time = 10.0
+    await coordinator.update_method()
+    await coordinator.update_method()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        {"config_entry_id": config_entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["count"] == 2
+    assert response["input"] == [25.0, 25.0]
+    assert response["timestamp"][0] <= response["timestamp"][1]
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_EXPORT_HISTORY,
+            {"config_entry_id": "missing"},
+            blocking=True,
+            return_response=True,
+        )
@@ -1,7 +1,19 @@
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_NAME
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
 from custom_components.simple_cooler_heater_pid import (
     async_unload_entry,
 )
-from custom_components.simple_cooler_heater_pid.const import DOMAIN
+from custom_components.simple_cooler_heater_pid.const import (
+    DOMAIN,
+    CONF_EXECUTION_MODE,
+    CONF_INPUT_RANGE_MAX,
+    CONF_INPUT_RANGE_MIN,
+    CONF_OUTPUT_ENTITY,
+    CONF_SENSOR_ENTITY_ID,
+    EXECUTION_MODE_INPUT_CHANGE,
+)
 
 
 async def test_setup_and_unload_entry(hass, config_entry):
@@ -30,3 +42,135 @@ async def test_setup_and_unload_entry(hass, config_entry):
     # hass Data should be gone
 
     assert DOMAIN not in hass.data
+
+
+async def test_parameter_change_triggers_refresh(hass, config_entry, monkeypatch):
+    """Changing a parameter entity requests exactly one coordinator refresh."""
+    coordinator = config_entry.runtime_data.coordinator
+    called = []
+
+    async def fake_refresh():
+        called.append(True)
+
+    monkeypatch.setattr(coordinator, "async_request_refresh", fake_refresh)
+
+    await hass.services.async_call(
+        "number",
+        "set_value",
+        {"entity_id": f"number.{config_entry.entry_id}_kp", "value": 3.0},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert called == [True]
+
+    # State changes of unrelated entities are not dispatched to the controller
+    hass.states.async_set("number.somebody_else", "1")
+    await hass.async_block_till_done()
+    assert called == [True]
+
+
+async def test_parameter_tracking_removed_on_unload(hass, config_entry):
+    """Unloading the entry unsubscribes the parameter tracking."""
+    handle = config_entry.runtime_data.handle
+    assert handle._parameter_unsub is not None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert handle._parameter_unsub is None
+
+
+async def test_options_applied_without_reload(hass, config_entry):
+    """Range, sensor and output changes keep the running controller."""
+    handle = config_entry.runtime_data.handle
+    pid = handle.pid
+    hass.states.async_set("sensor.other_input", "20.0")
+    hass.states.async_set("number.valve", "0", {"min": 0, "max": 10, "step": 1})
+
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_SENSOR_ENTITY_ID: "sensor.other_input",
+            CONF_INPUT_RANGE_MIN: 10.0,
+            CONF_INPUT_RANGE_MAX: 30.0,
+            CONF_OUTPUT_ENTITY: "number.valve",
+        },
+    )
+    await hass.async_block_till_done()
+
+    # Same handle and PID, so the integrator survives
+    assert config_entry.runtime_data.handle is handle
+    assert handle.pid is pid
+    assert handle.sensor_entity_id == "sensor.other_input"
+    assert handle.get_input_sensor_value() == 20.0
+    assert handle.get_actuator_profile().entity_id == "number.valve"
+
+    setpoint = hass.states.get(f"number.{config_entry.entry_id.lower()}_setpoint")
+    assert setpoint.attributes["min"] == 10.0
+    assert setpoint.attributes["max"] == 30.0
+    assert 10.0 <= handle.params.setpoint <= 30.0
+
+
+async def test_execution_mode_change_reloads(hass, config_entry):
+    """Switching the execution mode sets the entry up again."""
+    handle = config_entry.runtime_data.handle
+
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_EXECUTION_MODE: EXECUTION_MODE_INPUT_CHANGE}
+    )
+    await hass.async_block_till_done()
+
+    assert config_entry.runtime_data.handle is not handle
+    assert config_entry.runtime_data.handle.execution_mode == (
+        EXECUTION_MODE_INPUT_CHANGE
+    )
+
+
+async def test_setup_waits_for_missing_input_sensor(hass, config_entry):
+    """Setup completes without the input and the first tick follows it."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="PID3",
+        title="Late PID Controller",
+        data={CONF_SENSOR_ENTITY_ID: "sensor.late_input", CONF_NAME: "PID3"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    handle = entry.runtime_data.handle
+    coordinator = entry.runtime_data.coordinator
+    assert handle.input_pending
+    assert coordinator.data is None
+
+    hass.states.async_set("sensor.late_input", "unavailable")
+    await hass.async_block_till_done()
+    assert handle.input_pending
+
+    hass.states.async_set("sensor.late_input", "18.5")
+    await hass.async_block_till_done()
+
+    assert not handle.input_pending
+    assert coordinator.last_update_success
+    assert coordinator.data is not None
+    assert handle.last_tick.input == 18.5
+
+
+async def test_waiting_for_input_stops_on_unload(hass, config_entry):
+    """An entry unloaded while waiting drops its subscription."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="PID3",
+        title="Late PID Controller",
+        data={CONF_SENSOR_ENTITY_ID: "sensor.late_input", CONF_NAME: "PID3"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    handle = entry.runtime_data.handle
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert not handle.input_pending
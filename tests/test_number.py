@@ -157,3 +157,14 @@ async def test_controlparameter_number_unexpected_key(
     assert f"Unknown PID key '{invalid_key}'. Using default values:" in caplog.text
     assert num._attr_native_min_value == expected_min
     assert num._attr_native_max_value == expected_max
+
+
+async def test_number_pushes_value_into_handle_params(hass, config_entry):
+    """Setting a number entity updates the shared parameter record."""
+    handle = config_entry.runtime_data.handle
+    entity_id = f"number.{config_entry.entry_id}_kp"
+
+    await hass.services.async_call(
+        "number", "set_value", {"entity_id": entity_id, "value": 2.5}, blocking=True
+    )
+    assert handle.params.kp == 2.5
@@ -0,0 +1,85 @@
+from custom_components.simple_cooler_heater_pid import sensor as sensor_module
+from custom_components.simple_cooler_heater_pid.parameters import (
+    PARAMETER_KEYS,
+    PIDParameters,
+)
+
+
+def _set_defaults(params):
+    for key, value in {
+        "kp": 1.0,
+        "ki": 0.1,
+        "kd": 0.01,
+        "setpoint": 50.0,
+        "starting_output": 0.0,
+        "sample_time": 10.0,
+        "output_min": 0.0,
+        "output_max": 100.0,
+    }.items():
+        setattr(params, key, value)
+
+
+def test_parameters_track_changes():
+    """Assignments are remembered until popped; equal pushes are ignored."""
+    params = PIDParameters()
+    assert params.pop_changes() == set(PARAMETER_KEYS)
+    assert params.pop_changes() == set()
+
+    params.kp = 2.0
+    params.update("setpoint", 20.0)
+    params.update("unknown", 1.0)
+    assert params.pop_changes() == {"kp", "setpoint"}
+
+    params.update("setpoint", 20.0)
+    assert params.pop_changes() == set()
+
+    params.mark_changed(["ki"])
+    assert params.pop_changes() == {"ki"}
+
+
+async def test_only_changed_parameters_reach_pid(hass, config_entry):
+    """A steady tick leaves the PID settings alone, a change applies just that."""
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    _set_defaults(handle.params)
+    handle.params.cooling_mode = False
+    await coordinator.update_method()
+    assert handle.pid.tunings == (1.0, 0.1, 0.01)
+
+    # Changed behind the back of the loop: a steady tick must not undo it
+    handle.pid.setpoint = 10.0
+    await coordinator.update_method()
+    assert handle.pid.setpoint == 10.0
+
+    handle.params.kp = 3.0
+    await coordinator.update_method()
+    assert handle.pid.tunings == (3.0, 0.1, 0.01)
+    assert handle.pid.setpoint == 10.0
+
+    handle.params.setpoint = 40.0
+    await coordinator.update_method()
+    assert handle.pid.setpoint == 40.0
+
+
+async def test_steady_state_tick_applies_nothing(monkeypatch, hass, config_entry):
+    """A steady tick applies no parameters, a full one applies all of them."""
+    handle = config_entry.runtime_data.handle
+    update = config_entry.runtime_data.coordinator.update_method
+    _set_defaults(handle.params)
+    await update()
+    applied = []
+    apply = sensor_module._apply_parameters
+
+    def counting_apply(handle, changed):
+        applied.append(set(changed))
+        apply(handle, changed)
+
+    monkeypatch.setattr(sensor_module, "_apply_parameters", counting_apply)
+
+    for _ in range(100):
+        await update()
+    assert applied == []
+
+    handle.params.mark_changed()
+    await update()
+    assert applied == [set(PARAMETER_KEYS)]
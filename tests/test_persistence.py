@@ -0,0 +1,103 @@
+import copy
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.simple_cooler_heater_pid.const import DOMAIN
+from custom_components.simple_cooler_heater_pid.persistence import SAVE_DELAY
+
+
+async def test_pid_state_restored_after_reload(hass, config_entry):
+    """Integrator, last input and output survive a reload of the entry."""
+    pid = config_entry.runtime_data.handle.pid
+    pid._integral = 4.2
+    pid._last_input = 21.5
+    pid._last_error = -1.5
+    pid._last_output = 6.0
+    pid._auto_mode = True
+    config_entry.runtime_data.handle.last_known_output = 6.0
+
+    assert await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    handle = config_entry.runtime_data.handle
+    assert handle.pid._integral == 4.2
+    assert handle.pid._last_input == 21.5
+    assert handle.pid._last_error == -1.5
+    assert handle.pid._last_output == 6.0
+    assert handle.pid.auto_mode is True
+    assert handle.last_known_output == 6.0
+
+
+async def test_first_tick_after_restore_is_bumpless(hass, config_entry):
+    """Switching auto mode on after a restore does not reset the integrator."""
+    pid = config_entry.runtime_data.handle.pid
+    pid._integral = 4.2
+    pid._auto_mode = True
+
+    assert await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    handle = config_entry.runtime_data.handle
+    # At the setpoint, so the tick itself does not move the integrator
+    hass.states.async_set("sensor.test_input", str(handle.params.setpoint))
+    await config_entry.runtime_data.coordinator.async_refresh()
+    # Zero start would have reset the integrator to 0 on a cold start
+    assert handle.pid._integral != 0
+    assert abs(handle.pid._integral - 4.2) < 1
+
+
+async def test_state_save_is_debounced(hass, config_entry, hass_storage):
+    """Many ticks lead to one write, holding the latest state."""
+    handle = config_entry.runtime_data.handle
+    key = f"{DOMAIN}.{config_entry.entry_id}"
+    hass_storage.pop(key, None)
+
+    for value in (1.0, 2.0, 3.0):
+        handle.pid._integral = value
+        handle.state_store.async_schedule_save()
+        await hass.async_block_till_done()
+    assert key not in hass_storage
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+
+    # The write takes the state at the time it runs, ticks included
+    saved = hass_storage[key]["data"]["pid"]
+    assert saved["integral"] == handle.pid._integral
+
+
+async def test_state_removed_with_entry(hass, config_entry, hass_storage):
+    """Deleting the entry deletes its saved state."""
+    key = f"{DOMAIN}.{config_entry.entry_id}"
+    await config_entry.runtime_data.handle.state_store.async_save()
+    assert key in hass_storage
+
+    assert await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert key not in hass_storage
+
+
+async def test_output_after_restore_continues_saved_output(hass, config_entry):
+    """The first tick after a restore gives the tick the old run would have."""
+    # Just past the setpoint, so the output stays within its limits
+    hass.states.async_set("sensor.test_input", "51.0")
+    coordinator = config_entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+    handle = config_entry.runtime_data.handle
+    # What the next tick would have given without the restart
+    expected = copy.deepcopy(handle.pid)(
+        handle.get_input_sensor_value(), dt=handle.params.sample_time
+    )
+
+    assert await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    handle = config_entry.runtime_data.handle
+    assert handle.last_tick is None
+
+    await config_entry.runtime_data.coordinator.async_refresh()
+    assert handle.last_tick.output == pytest.approx(expected)
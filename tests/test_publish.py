@@ -0,0 +1,64 @@
+from custom_components.simple_cooler_heater_pid.const import CONF_PUBLISH_EVERY_N_TICKS
+from custom_components.simple_cooler_heater_pid.publish import (
+    PublishPolicy,
+    StateDecimator,
+)
+
+
+def test_default_policy_publishes_every_tick():
+    """Without a policy every update is written."""
+    decimator = StateDecimator(PublishPolicy())
+    assert all(decimator.should_publish(1.0, True, now) for now in range(5))
+    assert decimator.suppressed == 0
+
+
+def test_every_n_ticks_and_min_interval():
+    """Ticks and time between writes are both limited."""
+    decimator = StateDecimator(PublishPolicy(every_n_ticks=3))
+    written = [decimator.should_publish(float(n), True, n) for n in range(7)]
+    assert written == [True, False, False, True, False, False, True]
+
+    decimator = StateDecimator(PublishPolicy(min_interval=10.0))
+    written = [decimator.should_publish(float(n), True, n * 4.0) for n in range(6)]
+    assert written == [True, False, False, True, False, False]
+
+
+def test_significant_change_only():
+    """Small changes against the last written value are held back."""
+    decimator = StateDecimator(PublishPolicy(min_change=0.5))
+    assert decimator.should_publish(10.0, True, 0)
+    assert not decimator.should_publish(10.3, True, 1)
+    assert not decimator.should_publish(10.5, True, 2)
+    # drift accumulates against the last published value
+    assert decimator.should_publish(10.6, True, 3)
+
+    decimator = StateDecimator(PublishPolicy(min_change_relative=10))
+    assert decimator.should_publish(50.0, True, 0)
+    assert not decimator.should_publish(54.0, True, 1)
+    assert decimator.should_publish(56.0, True, 2)
+
+
+def test_availability_changes_always_published():
+    """Going unavailable or losing the value is never held back."""
+    decimator = StateDecimator(PublishPolicy(every_n_ticks=100, min_interval=60))
+    assert decimator.should_publish(1.0, True, 0)
+    assert decimator.should_publish(1.0, False, 1)
+    assert decimator.should_publish(1.0, True, 2)
+    assert decimator.should_publish(None, True, 3)
+
+
+async def test_output_sensor_decimated(hass, config_entry):
+    """The output sensor only writes every N coordinator updates."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_PUBLISH_EVERY_N_TICKS: 3}
+    )
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data.coordinator
+    entity_id = f"sensor.{config_entry.entry_id.lower()}_pid_output"
+
+    seen = []
+    for value in (1.0, 2.0, 3.0, 4.0, 5.0):
+        coordinator.async_set_updated_data(value)
+        await hass.async_block_till_done()
+        seen.append(hass.states.get(entity_id).state)
+    assert seen == ["1.0", "1.0", "1.0", "4.0", "4.0"]
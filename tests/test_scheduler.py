@@ -0,0 +1,234 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.util.async_ import get_scheduled_timer_handles
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.simple_cooler_heater_pid.const import (
+    CONF_EXECUTION_MODE,
+    DOMAIN,
+    EXECUTION_MODE_HIGH_RATE,
+    LATE_TICK_SKIP,
+)
+from custom_components.simple_cooler_heater_pid.coordinator import PIDDataCoordinator
+from custom_components.simple_cooler_heater_pid.scheduler import (
+    HighRateLoop,
+    PIDScheduler,
+    async_get_scheduler,
+)
+from custom_components.simple_cooler_heater_pid.sensor import DEFAULT_SAMPLE_TIME
+
+
+def _make_coordinators(hass, count, calls):
+    coordinators = []
+    for index in range(count):
+
+        async def fake_update(index=index):
+            calls.append(index)
+            return float(index)
+
+        coordinators.append(
+            PIDDataCoordinator(hass, f"c{index}", fake_update, interval=None)
+        )
+    return coordinators
+
+
+async def test_scheduler_groups_by_sample_time(hass):
+    """Timers scale with distinct sample times, not with controllers."""
+    scheduler = PIDScheduler(hass)
+    calls = []
+    coordinators = _make_coordinators(hass, 100, calls)
+    for index, coordinator in enumerate(coordinators):
+        scheduler.async_add(coordinator, 1.0 if index % 2 else 5.0)
+
+    assert scheduler.group_count == 2
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert sorted(calls) == list(range(1, 100, 2))
+
+    for coordinator in coordinators:
+        scheduler.async_remove(coordinator)
+    assert scheduler.group_count == 0
+
+
+async def test_scheduler_results_stay_per_coordinator(hass):
+    """Each coordinator of a batch receives its own result."""
+    scheduler = PIDScheduler(hass)
+    coordinators = _make_coordinators(hass, 3, [])
+    for coordinator in coordinators:
+        scheduler.async_add(coordinator, 2.0)
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert [coordinator.data for coordinator in coordinators] == [0.0, 1.0, 2.0]
+
+    for coordinator in coordinators:
+        scheduler.async_remove(coordinator)
+
+
+async def test_scheduler_moves_coordinator_on_new_sample_time(hass):
+    """Changing the sample time moves the coordinator to another group."""
+    scheduler = PIDScheduler(hass)
+    (coordinator,) = _make_coordinators(hass, 1, [])
+    scheduler.async_add(coordinator, 10.0)
+    scheduler.async_add(coordinator, 10.0)
+    assert scheduler.group_count == 1
+
+    scheduler.async_add(coordinator, 3.0)
+    assert scheduler.group_count == 1
+    assert list(scheduler._groups) == [3.0]
+    scheduler.async_remove(coordinator)
+
+
+async def test_scheduler_spreads_group_phases(hass):
+    """Groups created together do not fire in the same loop iteration."""
+    scheduler = PIDScheduler(hass)
+    first, second = _make_coordinators(hass, 2, [])
+    scheduler.async_add(first, 5.0)
+    scheduler.async_add(second, 10.0)
+
+    deadlines = [group.deadline for group in scheduler._groups.values()]
+    assert deadlines[0] % 5.0 != deadlines[1] % 5.0
+
+    scheduler.async_remove(first)
+    scheduler.async_remove(second)
+
+
+async def test_scheduler_registered_for_entry(hass, config_entry):
+    """The entry's coordinator is driven by the shared scheduler."""
+    scheduler = async_get_scheduler(hass)
+    coordinator = config_entry.runtime_data.coordinator
+    assert coordinator.update_interval is None
+    assert coordinator in scheduler._sample_times
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert DOMAIN not in hass.data
+
+
+async def test_high_rate_loop_keeps_absolute_deadlines(hass):
+    """Deadlines advance by exactly one sample time, however late a tick ran."""
+    calls = []
+    (coordinator,) = _make_coordinators(hass, 1, calls)
+    loop = HighRateLoop(hass, coordinator, 0.1)
+    loop.async_start()
+    first = loop._deadline
+
+    loop._async_tick()
+    await hass.async_block_till_done()
+    assert loop._deadline == first + 0.1
+    assert calls == [0]
+    assert coordinator.tick_time <= hass.loop.time()
+
+    loop.async_set_sample_time(0.05)
+    assert loop._deadline == pytest.approx(first + 0.05)
+    loop.async_stop()
+
+
+async def test_high_rate_loop_counts_overruns(hass):
+    """Missed deadlines and ticks hitting a busy run are counted, not queued."""
+    release = asyncio.Event()
+
+    async def slow_update():
+        await release.wait()
+        return 1.0
+
+    coordinator = PIDDataCoordinator(hass, "fast", slow_update, interval=None)
+    loop = HighRateLoop(hass, coordinator, 0.1)
+    loop.async_start()
+
+    # The loop woke up 3.5 periods late
+    now = hass.loop.time()
+    loop._deadline = now - 0.35
+    loop._async_tick()
+    assert coordinator.stats.missed == 3
+    assert coordinator.stats.late == 1
+    assert now < loop._deadline <= now + 0.1
+
+    # The previous run is still busy
+    loop._async_tick()
+    assert coordinator.stats.overruns == 1
+
+    release.set()
+    await hass.async_block_till_done()
+    assert coordinator.stats.ticks == 1
+    loop.async_stop()
+
+
+async def test_scheduler_late_tick_policies(hass):
+    """Late ticks are counted per controller and skipped only when asked."""
+    scheduler = PIDScheduler(hass)
+    calls = []
+    running, skipping = _make_coordinators(hass, 2, calls)
+    skipping.late_tick_policy = LATE_TICK_SKIP
+    scheduler.async_add(running, 1.0)
+    scheduler.async_add(skipping, 1.0)
+    group = scheduler._groups[1.0]
+
+    # An on-time tick is not late
+    now = hass.loop.time()
+    group.deadline = now
+    scheduler._async_tick(group)
+    await hass.async_block_till_done()
+    assert calls == [0, 1]
+    assert running.stats.late == 0
+
+    # The loop stalled for 2.5 sample times
+    group.deadline = hass.loop.time() - 2.5
+    scheduler._async_tick(group)
+    await hass.async_block_till_done()
+    assert calls == [0, 1, 0]
+    assert running.tick_time is not None
+    for coordinator in (running, skipping):
+        assert coordinator.stats.late == 1
+        assert coordinator.stats.missed == 2
+    assert skipping.stats.skipped == 1
+    assert group.deadline > hass.loop.time()
+
+    scheduler.async_remove(running)
+    scheduler.async_remove(skipping)
+
+
+async def test_high_rate_loop_stops_on_unload(hass, config_entry):
+    """After unloading, the high-rate loop neither runs nor fires again."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_EXECUTION_MODE: EXECUTION_MODE_HIGH_RATE}
+    )
+    await hass.async_block_till_done()
+    coordinator = config_entry.runtime_data.coordinator
+    started = []
+    release = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def hanging_update():
+        started.append(True)
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    coordinator.update_method = hanging_update
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=DEFAULT_SAMPLE_TIME))
+    await asyncio.sleep(0)
+    assert started == [True]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+    release.set()
+    assert not [
+        handle
+        for handle in get_scheduled_timer_handles(hass.loop)
+        if isinstance(getattr(handle._callback, "__self__", None), HighRateLoop)
+    ]
+
+    async_fire_time_changed(
+        hass, utcnow() + timedelta(seconds=10 * DEFAULT_SAMPLE_TIME)
+    )
+    await hass.async_block_till_done()
+    assert started == [True]
@@ -2,6 +2,7 @@ import pytest
 from datetime import timedelta
 from homeassistant.util.dt import utcnow
 from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from custom_components.simple_cooler_heater_pid import PIDDeviceHandle
 from custom_components.simple_cooler_heater_pid.select import (
     START_MODE_OPTIONS,
     PIDStartModeSelect,
@@ -9,7 +10,7 @@ from custom_components.simple_cooler_heater_pid.select import (
 
 
 @pytest.mark.asyncio
-async def test_pid_start_modes(hass, config_entry):
+async def test_pid_start_modes(monkeypatch, hass, config_entry):
     """Check start modes."""
 
     sample_time = 5
@@ -21,12 +22,13 @@ async def test_pid_start_modes(hass, config_entry):
     for start_mode in ["Zero start", "Startup value", "Last known value"]:
         # reset de PID state per iteratie
         handle = config_entry.runtime_data.handle
-        handle.init_phase = True
         handle.last_known_output = 80.0
 
-        handle.get_input_sensor_value = lambda: base_input
-        handle.get_select = lambda key: start_mode if key == "start_mode" else None
-        handle.get_number = lambda key: {
+        monkeypatch.setattr(
+            PIDDeviceHandle, "get_input_sensor_value", lambda self: base_input
+        )
+        handle.params.start_mode = start_mode
+        for key, value in {
             "kp": 1.0,
             "ki": 0.1,
             "kd": 0.01,
@@ -35,8 +37,8 @@ async def test_pid_start_modes(hass, config_entry):
             "sample_time": sample_time,
             "output_min": 0.0,
             "output_max": 100.0,
-        }[key]
-        handle.get_switch = lambda key: True
+        }.items():
+            setattr(handle.params, key, value)
 
         # trigger initial update
         hass.bus.async_fire("homeassistant_started")
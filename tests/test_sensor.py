@@ -2,6 +2,7 @@ import pytest
 from datetime import timedelta
 from homeassistant.util.dt import utcnow
 from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from custom_components.simple_cooler_heater_pid import PIDDeviceHandle
 from custom_components.simple_cooler_heater_pid.sensor import (
     PIDContributionSensor,
     PIDOutputSensor,
@@ -9,20 +10,24 @@ from custom_components.simple_cooler_heater_pid.sensor import (
 from custom_components.simple_cooler_heater_pid.coordinator import PIDDataCoordinator
 from custom_components.simple_cooler_heater_pid.sensor import async_setup_entry
 from custom_components.simple_cooler_heater_pid import sensor as sensor_module
+from custom_components.simple_cooler_heater_pid.tick import PIDTick
+from custom_components.simple_cooler_heater_pid.const import (
+    CONF_EXECUTION_MODE,
+    EXECUTION_MODE_HIGH_RATE,
+    LATE_TICK_CLAMP_DT,
+)
 
 
 @pytest.mark.asyncio
-async def test_pid_output_and_contributions_update(hass, config_entry):
+async def test_pid_output_and_contributions_update(monkeypatch, hass, config_entry):
     """Test that PID output and contribution sensors update on Home Assistant start."""
     sample_time = 5
 
     handle = config_entry.runtime_data.handle
 
-    handle.get_input_sensor_value = lambda: 10.0
-    handle.get_select = lambda key: {
-        "start_mode": "Startup value",
-    }[key]
-    handle.get_number = lambda key: {
+    monkeypatch.setattr(PIDDeviceHandle, "get_input_sensor_value", lambda self: 10.0)
+    handle.params.start_mode = "Startup value"
+    for key, value in {
         "kp": 1.0,
         "ki": 0.1,
         "kd": 0.01,
@@ -31,8 +36,8 @@ async def test_pid_output_and_contributions_update(hass, config_entry):
         "sample_time": sample_time,
         "output_min": 0.0,
         "output_max": 100.0,
-    }[key]
-    handle.get_switch = lambda key: True
+    }.items():
+        setattr(handle.params, key, value)
 
     # 1) trigger initial update
     hass.bus.async_fire("homeassistant_started")
@@ -54,8 +59,18 @@ async def test_pid_output_and_contributions_update(hass, config_entry):
 async def test_pid_contribution_native_value_rounding_and_none(hass, config_entry):
     """Test that PIDContributionSensor.native_value rounds correctly and returns None for unknown key."""
     handle = config_entry.runtime_data.handle
-    # Provide known contributions
-    handle.last_contributions = (0.1234, 1.9876, 2.5555, 3.3789)
+    # Provide a known tick
+    handle.last_tick = PIDTick(
+        timestamp=0.0,
+        input=25.0,
+        setpoint=50.0,
+        error=-25.0,
+        p=0.1234,
+        i=1.9876,
+        d=2.5555,
+        i_delta=3.3789,
+        output=4.6665,
+    )
     coordinator = PIDDataCoordinator(hass, "test", lambda: 0, interval=1)
 
     # Map contribution keys to expected values
@@ -92,56 +107,10 @@ async def test_pid_contribution_native_value_rounding_and_none(hass, config_entr
 
 
 @pytest.mark.asyncio
-async def test_listeners_trigger_refresh_sensor(hass, config_entry, monkeypatch):
-    """Lines 131-132: coordinator.async_request_refresh called on sensor state change."""
-    # Prepare handle
-    handle = config_entry.runtime_data.handle
-    handle.get_input_sensor_value = lambda: 0.0
-    handle.get_number = lambda key: 0.0
-    handle.get_switch = lambda key: True
-
-    # Capture listeners
-    listeners = []
-    monkeypatch.setattr(
-        type(hass.bus),
-        "async_listen",
-        lambda self, event, cb: listeners.append((event, cb)),
-    )
-
-    # Run setup to register listeners
-    entities = []
-    await async_setup_entry(hass, config_entry, lambda ents: entities.extend(ents))
-    coordinator = entities[0].coordinator
-
-    # Patch refresh method
-    called = []
-    monkeypatch.setattr(
-        coordinator, "async_request_refresh", lambda: called.append(True)
-    )
-
-    # Simulate state change event for kp
-    entry_id = config_entry.entry_id
-    test_entity = f"number.{entry_id}_kp"
-    callback = next(cb for evt, cb in listeners if evt == "state_changed")
-
-    from types import SimpleNamespace
-
-    event = SimpleNamespace(data={"entity_id": test_entity})
-    callback(event)
-    assert (
-        called
-    ), "Coordinator.async_request_refresh was not called on sensor state change"
-
-
-@pytest.mark.asyncio
-async def test_update_pid_raises_on_missing_input(hass, config_entry):
+async def test_update_pid_raises_on_missing_input(monkeypatch, hass, config_entry):
     """Line 47: update_pid should raise ValueError when input sensor unavailable."""
-    handle = config_entry.runtime_data.handle
     # Force no input value
-    handle.get_input_sensor_value = lambda: None
-    # Provide defaults for numbers and switches
-    handle.get_number = lambda key: 0.0
-    handle.get_switch = lambda key: True
+    monkeypatch.setattr(PIDDeviceHandle, "get_input_sensor_value", lambda self: None)
     # Setup entry to get coordinator with update_method
     entities: list = []
     await async_setup_entry(hass, config_entry, lambda e: entities.extend(e))
@@ -189,10 +158,10 @@ async def test_update_pid_output_limits_none_when_windup_protection_disabled(
 
     # init handle
     handle = config_entry.runtime_data.handle
-    handle.last_contributions = (0.0, 0.0, 0.0, 0.0)
+    handle.last_tick = None
     handle.last_known_output = 0.0
-    handle.get_input_sensor_value = lambda: 10.0
-    handle.get_number = lambda key: {
+    monkeypatch.setattr(PIDDeviceHandle, "get_input_sensor_value", lambda self: 10.0)
+    for key, value in {
         "kp": 1.0,
         "ki": 0.1,
         "kd": 0.01,
@@ -201,9 +170,10 @@ async def test_update_pid_output_limits_none_when_windup_protection_disabled(
         "sample_time": 5.0,
         "output_min": 0.0,
         "output_max": 100.0,
-    }.get(key, 0.0)
-    handle.get_switch = lambda key: False if key == "windup_protection" else True
-    handle.get_select = lambda key: "Zero start" if key == "start_mode" else None
+    }.items():
+        setattr(handle.params, key, value)
+    handle.params.windup_protection = False
+    handle.params.start_mode = "Zero start"
 
     # Set-up components and trigger update
     entities = []
@@ -299,10 +269,10 @@ async def test_update_pid_invalid_start_mode_defaults(monkeypatch, hass, config_
 
     # Prepare the handle
     handle = config_entry.runtime_data.handle
-    handle.last_contributions = (0.0, 0.0, 0.0, 0.0)
+    handle.last_tick = None
     handle.last_known_output = 99.9  # some non‐zero initial
-    handle.get_input_sensor_value = lambda: 10.0
-    handle.get_number = lambda key: {
+    monkeypatch.setattr(PIDDeviceHandle, "get_input_sensor_value", lambda self: 10.0)
+    for key, value in {
         "kp": 1.0,
         "ki": 0.1,
         "kd": 0.01,
@@ -311,9 +281,9 @@ async def test_update_pid_invalid_start_mode_defaults(monkeypatch, hass, config_
         "sample_time": 5.0,
         "output_min": 0.0,
         "output_max": 100.0,
-    }[key]
-    handle.get_switch = lambda key: True
-    handle.get_select = lambda key: "Invalid Mode" if key == "start_mode" else None
+    }.items():
+        setattr(handle.params, key, value)
+    handle.params.start_mode = "Invalid Mode"
 
     # Run setup and trigger one PID update
     entities = []
@@ -338,26 +308,89 @@ async def test_update_pid_invalid_start_mode_defaults(monkeypatch, hass, config_
     assert pid._output == 42.0
 
 
-def test_pid_contribution_error_when_input_or_setpoint_none(hass, config_entry):
-    """Line 258: native_value for 'error' should be 0 when input or setpoint is None."""
+async def test_pid_contribution_reads_tick_record(monkeypatch, hass, config_entry):
+    """Contribution sensors show the values of the last tick, not live states."""
     handle = config_entry.runtime_data.handle
-    handle.last_contributions = (1.0, 2.0, 3.0, 4.0)
     coordinator = PIDDataCoordinator(hass, "test", lambda: 0, interval=1)
-
-    # Case 1: input_value is None → error = 0
-    handle.get_input_sensor_value = lambda: None
-    handle.get_number = lambda key: 5.0
     sensor = PIDContributionSensor(
         hass, config_entry, "error", "Error Sensor", coordinator
     )
-    sensor._handle = handle
-    assert sensor.native_value == 0
 
-    # Case 2: setpoint is None → error = 0
-    handle.get_input_sensor_value = lambda: 10.0
-    handle.get_number = lambda key: None
-    sensor = PIDContributionSensor(
-        hass, config_entry, "error", "Error Sensor", coordinator
+    # No tick yet
+    handle.last_tick = None
+    assert sensor.native_value is None
+
+    for key, value in {
+        "kp": 1.0,
+        "ki": 0.1,
+        "kd": 0.0,
+        "setpoint": 5.0,
+        "sample_time": 5.0,
+        "output_min": 0.0,
+        "output_max": 100.0,
+    }.items():
+        setattr(handle.params, key, value)
+    monkeypatch.setattr(PIDDeviceHandle, "get_input_sensor_value", lambda self: 2.0)
+    entities = []
+    await async_setup_entry(hass, config_entry, lambda e: entities.extend(e))
+    await entities[0].coordinator.update_method()
+
+    # Later changes of the input do not leak into the published tick
+    monkeypatch.setattr(PIDDeviceHandle, "get_input_sensor_value", lambda self: 100.0)
+    tick = handle.last_tick
+    assert (tick.input, tick.setpoint, tick.error) == (2.0, 5.0, -3.0)
+    assert tick.i_delta == tick.i
+    assert sensor.native_value == -3.0
+
+
+async def test_high_rate_mode_feeds_measured_dt(monkeypatch, hass, config_entry):
+    """In high-rate mode the PID integrates over the time between ticks."""
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_EXECUTION_MODE: EXECUTION_MODE_HIGH_RATE}
     )
-    sensor._handle = handle
-    assert sensor.native_value == 0
+    await hass.async_block_till_done()
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    for key, value in {
+        "kp": 0.0,
+        "ki": 0.1,
+        "kd": 0.0,
+        "setpoint": 50.0,
+        "sample_time": 0.05,
+        "output_min": 0.0,
+        "output_max": 100.0,
+        "cooling_mode": False,
+    }.items():
+        setattr(handle.params, key, value)
+    monkeypatch.setattr(PIDDeviceHandle, "get_input_sensor_value", lambda self: 25.0)
+
+    await coordinator.update_method()
+    coordinator.tick_time = handle.last_tick.timestamp + 0.05
+    await coordinator.update_method()
+
+    assert handle.last_tick.i_delta == pytest.approx(0.1 * 25.0 * 0.05)
+
+
+async def test_clamp_dt_policy_limits_integration_time(monkeypatch, hass, config_entry):
+    """With clamp_dt a late tick integrates over at most one sample time."""
+    handle = config_entry.runtime_data.handle
+    coordinator = config_entry.runtime_data.coordinator
+    coordinator.late_tick_policy = LATE_TICK_CLAMP_DT
+    for key, value in {
+        "kp": 0.0,
+        "ki": 0.1,
+        "kd": 0.0,
+        "setpoint": 50.0,
+        "sample_time": 1.0,
+        "output_min": 0.0,
+        "output_max": 100.0,
+        "cooling_mode": False,
+    }.items():
+        setattr(handle.params, key, value)
+    monkeypatch.setattr(PIDDeviceHandle, "get_input_sensor_value", lambda self: 25.0)
+
+    await coordinator.update_method()
+    coordinator.tick_time = handle.last_tick.timestamp + 5.0
+    await coordinator.update_method()
+
+    assert handle.last_tick.i_delta == pytest.approx(0.1 * 25.0 * 1.0)
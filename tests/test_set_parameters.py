@@ -0,0 +1,123 @@
+import pytest
+
+from homeassistant.const import CONF_NAME
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.simple_cooler_heater_pid.const import (
+    CONF_SENSOR_ENTITY_ID,
+    DOMAIN,
+    SERVICE_SET_PARAMETERS,
+)
+
+
+def _count_runs(monkeypatch, entry):
+    """Count the PID evaluations of an entry's coordinator."""
+    coordinator = entry.runtime_data.coordinator
+    runs = []
+    update = coordinator.update_method
+
+    async def counting_update():
+        output = await update()
+        runs.append({"kp": entry.runtime_data.handle.pid.Kp})
+        return output
+
+    monkeypatch.setattr(coordinator, "update_method", counting_update)
+    return runs
+
+
+async def test_set_parameters_applies_all_with_one_run(hass, config_entry, monkeypatch):
+    """All parameters change together and the PID runs once."""
+    eid = config_entry.entry_id.lower()
+    runs = _count_runs(monkeypatch, config_entry)
+    coordinator = config_entry.runtime_data.coordinator
+    requests = []
+    request_refresh = coordinator.async_request_refresh
+
+    async def counting_request_refresh():
+        requests.append(True)
+        await request_refresh()
+
+    # Refresh requests the debouncer's cooldown would otherwise merge
+    monkeypatch.setattr(coordinator, "async_request_refresh", counting_request_refresh)
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_PARAMETERS,
+        {
+            "config_entry_id": config_entry.entry_id,
+            "kp": 2.5,
+            "ki": 0.5,
+            "setpoint": 40,
+            "cooling_mode": False,
+            "start_mode": "Startup value",
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get(f"number.{eid}_kp").state == "2.5"
+    assert hass.states.get(f"number.{eid}_ki").state == "0.5"
+    assert hass.states.get(f"number.{eid}_setpoint").state == "40.0"
+    assert hass.states.get(f"switch.{eid}_cooling_mode").state == "off"
+    assert hass.states.get(f"select.{eid}_pid_start_mode").state == "Startup value"
+
+    params = config_entry.runtime_data.handle.params
+    assert (params.kp, params.ki, params.setpoint) == (2.5, 0.5, 40.0)
+    # One evaluation, already with the new gain (not cooling, so not inverted)
+    assert runs == [{"kp": 2.5}]
+    # Requested by the action only, not by the batched state writes
+    assert requests == [True]
+
+
+async def test_set_parameters_on_several_controllers(hass, config_entry, monkeypatch):
+    """One call changes every listed controller."""
+    hass.states.async_set("sensor.other_input", "30.0")
+    other = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="PID3",
+        title="Other PID Controller",
+        data={CONF_SENSOR_ENTITY_ID: "sensor.other_input", CONF_NAME: "PID3"},
+    )
+    other.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(other.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_PARAMETERS,
+        {"config_entry_id": [config_entry.entry_id, other.entry_id], "kd": 1.5},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert config_entry.runtime_data.handle.params.kd == 1.5
+    assert other.runtime_data.handle.params.kd == 1.5
+    assert hass.states.get("number.pid3_kd").state == "1.5"
+
+
+async def test_set_parameters_out_of_range_changes_nothing(hass, config_entry):
+    """A value outside an entity's range rejects the whole call."""
+    params = config_entry.runtime_data.handle.params
+    kp = params.kp
+
+    with pytest.raises(ServiceValidationError) as err:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_PARAMETERS,
+            {"config_entry_id": config_entry.entry_id, "kp": 3.0, "kd": 500},
+            blocking=True,
+        )
+    assert err.value.translation_key == "value_out_of_range"
+    assert params.kp == kp
+
+
+async def test_set_parameters_unknown_entry(hass, config_entry):
+    """Unknown controllers are rejected."""
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_PARAMETERS,
+            {"config_entry_id": "nope", "kp": 1.0},
+            blocking=True,
+        )
@@ -0,0 +1,64 @@
+import pytest
+
+from tests.simulation import (
+    FirstOrderDeadTimePlant,
+    SecondOrderThermalPlant,
+    run_closed_loop,
+    step_metrics,
+)
+
+
+def test_step_metrics():
+    """Settling time and overshoot of a hand-made step response."""
+    values = [0.0, 5.0, 11.0, 10.5, 10.1, 10.0, 10.0]
+    settling_time, overshoot = step_metrics(values, 0.0, 10.0, dt=1.0)
+    assert settling_time == 4.0
+    assert round(overshoot, 6) == 10.0
+
+
+def test_fopdt_plant_reaches_gain():
+    """The FOPDT plant honours its dead time and settles at ambient + gain * u."""
+    plant = FirstOrderDeadTimePlant(gain=0.5, tau=10, dead_time=3, ambient=20)
+    values = [plant.step(100.0) for _ in range(200)]
+    assert values[2] == 20
+    assert values[3] > 20
+    assert abs(values[-1] - 70) < 1e-6
+
+
+async def test_simulate_fopdt_heating(hass, config_entry):
+    """The real PID loop settles a FOPDT process."""
+    plant = FirstOrderDeadTimePlant(gain=0.5, tau=300, dead_time=30, ambient=20)
+    result = await run_closed_loop(
+        hass, config_entry, plant, setpoint=40, duration=4000, kp=10.0, ki=0.04
+    )
+    assert result.settling_time is not None
+    assert result.settling_time < 3000
+    assert result.overshoot_pct < 25
+    assert abs(result.final_value - 40) < 0.4
+
+
+@pytest.mark.benchmark
+async def test_benchmark_simulation_faster_than_real_time(hass, config_entry):
+    """The simulated FOPDT loop runs far faster than real time."""
+    plant = FirstOrderDeadTimePlant(gain=0.5, tau=300, dead_time=30, ambient=20)
+    result = await run_closed_loop(
+        hass, config_entry, plant, setpoint=40, duration=4000, kp=10.0, ki=0.04
+    )
+    assert result.sim_seconds_per_wall_second > 100
+
+
+async def test_simulate_second_order_thermal(hass, config_entry):
+    """The real PID loop controls a two-mass thermal model."""
+    plant = SecondOrderThermalPlant(
+        power=2000,
+        c_heater=20000,
+        c_room=200000,
+        r_heater_room=0.01,
+        r_room_ambient=0.02,
+        ambient=20,
+    )
+    result = await run_closed_loop(
+        hass, config_entry, plant, setpoint=30, duration=20000, kp=20.0, ki=0.01
+    )
+    assert result.settling_time is not None
+    assert abs(result.final_value - 30) < 0.2
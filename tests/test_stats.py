@@ -0,0 +1,132 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.simple_cooler_heater_pid.coordinator import PIDDataCoordinator
+from custom_components.simple_cooler_heater_pid.scheduler import PIDScheduler
+from custom_components.simple_cooler_heater_pid.stats import (
+    LATENCY_BUCKETS,
+    TickStats,
+)
+
+
+def test_tick_stats_histogram_and_jitter():
+    """Latencies land in buckets and jitter is measured against the interval."""
+    stats = TickStats()
+    stats.expected_interval = 1.0
+    stats.record(100.0, 0.0002, False)
+    stats.record(101.1, 0.0002, False)
+    stats.record(102.0, 0.2, True)
+
+    assert stats.ticks == 3
+    assert stats.failed == 1
+    assert stats.histogram[LATENCY_BUCKETS.index(0.00025)] == 2
+    assert stats.histogram[-1] == 1
+    assert stats.latency_percentile(50) == 0.00025
+    assert stats.latency_percentile(95) == 0.2
+    assert abs(stats.mean_jitter - 0.1) < 1e-9
+    assert abs(stats.max_jitter - 0.1) < 1e-9
+
+    data = stats.as_dict()
+    assert data["failed"] == 1
+    assert data["latency_histogram"][">100ms"] == 1
+    assert sum(data["latency_histogram"].values()) == 3
+
+
+def test_tick_stats_empty():
+    """Nothing recorded yet means no percentiles and no jitter."""
+    stats = TickStats()
+    assert stats.latency_percentile(95) is None
+    assert stats.mean_jitter is None
+
+
+async def test_coordinator_counts_failed_ticks(hass):
+    """A failing update is timed and counted."""
+
+    async def failing_update():
+        raise ValueError("Input sensor not available")
+
+    coordinator = PIDDataCoordinator(hass, "fail", failing_update, interval=None)
+    await coordinator.async_refresh()
+
+    assert coordinator.stats.ticks == 1
+    assert coordinator.stats.failed == 1
+    assert coordinator.stats.last_latency is not None
+
+
+async def test_scheduler_skips_tick_while_previous_runs(hass):
+    """A tick arriving while the previous batch still runs is skipped."""
+    release = asyncio.Event()
+
+    async def slow_update():
+        await release.wait()
+        return 1.0
+
+    scheduler = PIDScheduler(hass)
+    coordinator = PIDDataCoordinator(hass, "slow", slow_update, interval=None)
+    scheduler.async_add(coordinator, 1.0)
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=1))
+    await asyncio.sleep(0)
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=2))
+    await asyncio.sleep(0)
+    assert coordinator.stats.skipped == 1
+
+    release.set()
+    await hass.async_block_till_done()
+    assert coordinator.stats.ticks == 1
+    scheduler.async_remove(coordinator)
+
+
+async def test_parameter_refresh_leaves_jitter_alone(hass, config_entry):
+    """A refresh after a parameter change is counted but not taken as jitter."""
+    coordinator = config_entry.runtime_data.coordinator
+    stats = coordinator.stats
+    sample_time = config_entry.runtime_data.handle.params.sample_time
+    start = utcnow()
+
+    for tick in (1, 2, 3):
+        async_fire_time_changed(hass, start + timedelta(seconds=tick * sample_time))
+        await hass.async_block_till_done()
+    assert stats.last_jitter is not None
+    ticks = stats.ticks
+    jitter = (stats.last_start, stats.last_jitter, stats.mean_jitter, stats.max_jitter)
+
+    await hass.services.async_call(
+        "number",
+        "set_value",
+        {"entity_id": f"number.{config_entry.entry_id.lower()}_kp", "value": 2.7},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert stats.ticks == ticks + 1
+    assert (
+        stats.last_start,
+        stats.last_jitter,
+        stats.mean_jitter,
+        stats.max_jitter,
+    ) == jitter
+
+
+async def test_failed_timed_tick_does_not_leak_tick_time(hass, config_entry):
+    """A timed tick failing on its input leaves the next refresh untimed."""
+    coordinator = config_entry.runtime_data.coordinator
+    stats = coordinator.stats
+    hass.states.async_set("sensor.test_input", "unavailable")
+    coordinator.tick_time = hass.loop.time() - 5
+    await coordinator.async_refresh()
+    assert stats.failed == 1
+    assert coordinator.tick_time is None
+    last_start = stats.last_start
+
+    hass.states.async_set("sensor.test_input", "25.0")
+    await coordinator.async_refresh()
+
+    assert stats.last_start == last_start
+    tick = config_entry.runtime_data.handle.last_tick
+    assert tick.timestamp == pytest.approx(hass.loop.time(), abs=1)